@@ -15,6 +15,7 @@ from src.config import CORS_ORIGINS, HOST, PORT
 from src.logging_config import setup_logging
 from src.database.connection import init_database, get_stats
 from src.database import queries
+from src.scraper.ranking_scraper import close_async_browser
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -29,6 +30,7 @@ async def lifespan(app: FastAPI):
     logger.info("[INIT] Application démarrée")
     yield
     # Shutdown
+    await close_async_browser()
     logger.info("[INIT] Application arrêtée")
 
 
@@ -40,13 +42,10 @@ def _init_clubs_if_empty():
             logger.info("[INIT] Base de données vide, chargement des clubs depuis AFTT...")
             from src.scraper.clubs_scraper import get_all_clubs
             clubs = get_all_clubs()
-            for club in clubs:
-                club_dict = {
-                    'code': club.code,
-                    'name': club.name,
-                    'province': club.province
-                }
-                queries.insert_club(club_dict)
+            queries.insert_clubs_batch([
+                {'code': club.code, 'name': club.name, 'province': club.province}
+                for club in clubs
+            ])
             logger.info(f"[INIT] {len(clubs)} clubs chargés")
     except Exception as e:
         logger.error(f"[INIT] Erreur lors du chargement initial des clubs: {e}")
@@ -156,8 +156,7 @@ async def scrape_club(code: str, include_ranking: bool = True):
                     }
 
         # 4. Importer les joueurs
-        for licence, player_data in all_players.items():
-            queries.insert_player(player_data)
+        queries.insert_players_batch(list(all_players.values()))
 
         # 5. Scraper les fiches individuelles
         players_scraped = 0
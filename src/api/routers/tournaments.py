@@ -7,7 +7,9 @@ import asyncio
 import logging
 from datetime import datetime
 
+from src.config import SCRAPE_MAX_WORKERS
 from src.database import queries
+from src.database.connection import get_db
 from src.api.cache import cache
 
 logger = logging.getLogger(__name__)
@@ -99,10 +101,7 @@ async def run_tournament_scrape(task_id: str):
     """Exécute le scraping des tournois en arrière-plan."""
     global _current_tournament_scrape
 
-    from src.scraper.tournament_scraper import (
-        get_all_tournaments, get_tournament_series,
-        get_tournament_inscriptions, get_tournament_results
-    )
+    from src.scraper.tournament_scraper import get_all_tournaments, get_tournament_details
 
     _tournament_scrape_logs[task_id] = []
 
@@ -121,50 +120,54 @@ async def run_tournament_scrape(task_id: str):
         'total_results': 0, 'current_tournament': None, 'errors': []
     }
 
-    try:
-        add_log("[TOURNAMENTS] Récupération de la liste des tournois...")
-        tournaments = get_all_tournaments()
-        _current_tournament_scrape['total_tournaments'] = len(tournaments)
-        add_log(f"[TOURNAMENTS] {len(tournaments)} tournois trouvés")
-
-        for tournament in tournaments:
-            queries.insert_tournament(tournament.to_dict())
-        add_log("[TOURNAMENTS] Tournois sauvegardés dans la base")
+    # Le scraper est synchrone : il tourne dans des threads pour ne pas bloquer
+    # la boucle d'événements, au plus SCRAPE_MAX_WORKERS tournois à la fois.
+    # Scraping manuel : pages toujours récupérées (use_cache=False), le cache est rafraîchi
+    semaphore = asyncio.Semaphore(SCRAPE_MAX_WORKERS)
 
-        for i, tournament in enumerate(tournaments, 1):
+    async def scrape_tournament(tournament, total):
+        async with semaphore:
             # Vérifier si le scraping a été annulé
             if _current_tournament_scrape.get('status') != 'running':
-                add_log(f"[TOURNAMENTS] Scraping annulé par l'utilisateur")
                 return
 
             _current_tournament_scrape['current_tournament'] = tournament.name
-            _current_tournament_scrape['completed_tournaments'] = i - 1
-            add_log(f"[TOURNAMENTS] {i}/{len(tournaments)} - {tournament.name}...")
+            add_log(f"[TOURNAMENTS] {tournament.name}...")
 
             try:
-                series = get_tournament_series(tournament.t_id)
-                for s in series:
-                    queries.insert_tournament_series(s.to_dict())
-                _current_tournament_scrape['total_series'] += len(series)
-                await asyncio.sleep(0.2)
-
-                inscriptions = get_tournament_inscriptions(tournament.t_id)
-                for insc in inscriptions:
-                    queries.insert_tournament_inscription(insc.to_dict())
-                _current_tournament_scrape['total_inscriptions'] += len(inscriptions)
-                await asyncio.sleep(0.2)
-
-                results = get_tournament_results(tournament.t_id)
-                for res in results:
-                    queries.insert_tournament_result(res.to_dict())
-                _current_tournament_scrape['total_results'] += len(results)
-
-                add_log(f"[TOURNAMENTS]   -> {len(series)} séries, {len(inscriptions)} inscriptions, {len(results)} résultats")
+                details = await asyncio.to_thread(get_tournament_details, tournament.t_id, False)
+
+                with get_db() as db:
+                    queries.insert_tournament_series_batch(details['series'], db)
+                    queries.insert_tournament_inscriptions_batch(details['inscriptions'], db)
+                    queries.insert_tournament_results_batch(details['results'], db)
+
+                _current_tournament_scrape['total_series'] += len(details['series'])
+                _current_tournament_scrape['total_inscriptions'] += len(details['inscriptions'])
+                _current_tournament_scrape['total_results'] += len(details['results'])
+                add_log(f"[TOURNAMENTS]   -> {tournament.name}: {len(details['series'])} séries, "
+                        f"{len(details['inscriptions'])} inscriptions, {len(details['results'])} résultats")
             except Exception as e:
                 _current_tournament_scrape['errors'].append(f"Erreur pour {tournament.name}: {str(e)}")
-                add_log(f"[TOURNAMENTS]   -> Erreur: {e}")
+                add_log(f"[TOURNAMENTS]   -> Erreur pour {tournament.name}: {e}")
+
+            _current_tournament_scrape['completed_tournaments'] += 1
+            add_log(f"[TOURNAMENTS] {_current_tournament_scrape['completed_tournaments']}/{total} terminés")
+
+    try:
+        add_log("[TOURNAMENTS] Récupération de la liste des tournois...")
+        tournaments = await asyncio.to_thread(get_all_tournaments, False)
+        _current_tournament_scrape['total_tournaments'] = len(tournaments)
+        add_log(f"[TOURNAMENTS] {len(tournaments)} tournois trouvés")
+
+        queries.insert_tournaments_batch([t.to_dict() for t in tournaments])
+        add_log("[TOURNAMENTS] Tournois sauvegardés dans la base")
 
-            await asyncio.sleep(0.3)
+        await asyncio.gather(*(scrape_tournament(t, len(tournaments)) for t in tournaments))
+
+        if _current_tournament_scrape.get('status') != 'running':
+            add_log(f"[TOURNAMENTS] Scraping annulé par l'utilisateur")
+            return
 
         _current_tournament_scrape['completed_tournaments'] = len(tournaments)
         _current_tournament_scrape['status'] = 'success'
@@ -261,30 +264,26 @@ async def cancel_tournament_scrape():
 @router.post("/tournaments/{t_id}/scrape", tags=["Tournament Scraping"])
 async def scrape_single_tournament(t_id: int):
     """Rescrape un tournoi : supprime les anciennes donnees puis reimporte series, inscriptions et resultats."""
-    from src.scraper.tournament_scraper import (
-        get_tournament_series as scrape_series,
-        get_tournament_inscriptions as scrape_inscriptions,
-        get_tournament_results as scrape_results
-    )
+    from src.scraper.tournament_scraper import get_tournament_details
 
     try:
         tournament = queries.get_tournament(t_id)
         if not tournament:
             raise HTTPException(status_code=404, detail=f"Tournoi {t_id} non trouvé. Lancez d'abord /api/scrape/tournaments")
 
-        queries.delete_tournament_data(t_id)
-
-        series = scrape_series(t_id)
-        for s in series:
-            queries.insert_tournament_series(s.to_dict())
-
-        inscriptions = scrape_inscriptions(t_id)
-        for insc in inscriptions:
-            queries.insert_tournament_inscription(insc.to_dict())
-
-        results = scrape_results(t_id)
-        for res in results:
-            queries.insert_tournament_result(res.to_dict())
+        # Scraper d'abord (hors boucle d'événements) pour ne rien supprimer en cas d'échec réseau
+        # use_cache=False : un rescrape explicite ne doit pas relire des pages en cache
+        details = await asyncio.to_thread(get_tournament_details, t_id, False)
+        series = details['series']
+        inscriptions = details['inscriptions']
+        results = details['results']
+
+        # Suppression et réimport dans une seule transaction
+        with get_db() as db:
+            queries.delete_tournament_data(t_id, db)
+            queries.insert_tournament_series_batch(series, db)
+            queries.insert_tournament_inscriptions_batch(inscriptions, db)
+            queries.insert_tournament_results_batch(results, db)
 
         return {
             "success": True, "tournament_id": t_id,
@@ -23,3 +23,12 @@ SCRAPE_DELAY = float(os.environ.get('AFTT_SCRAPE_DELAY', '0.3'))
 SCRAPE_RETRY_DELAY_BASE = float(os.environ.get('AFTT_RETRY_DELAY', '2.0'))
 SCRAPE_MAX_RETRIES = int(os.environ.get('AFTT_MAX_RETRIES', '3'))
 SCRAPE_TIMEOUT = int(os.environ.get('AFTT_SCRAPE_TIMEOUT', '30'))
+SCRAPE_MAX_WORKERS = int(os.environ.get('AFTT_SCRAPE_WORKERS', '8'))
+
+# Cache disque des pages HTML scrapées (fiches joueurs, tournois)
+SCRAPE_CACHE_DIR = os.environ.get('AFTT_CACHE_DIR',
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'cache'))
+SCRAPE_CACHE_TTL = int(os.environ.get('AFTT_CACHE_TTL', '3600'))
+SCRAPE_CACHE_ENABLED = os.environ.get('AFTT_NO_CACHE', '0') != '1'
+# Pages de détail des tournois (séries, inscriptions, résultats)
+TOURNAMENT_CACHE_TTL = int(os.environ.get('AFTT_TOURNAMENT_CACHE_TTL', '86400'))
@@ -2,7 +2,9 @@
 Gestion de la connexion à la base de données SQLite
 """
 import sqlite3
+import atexit
 import os
+import threading
 from contextlib import contextmanager
 from typing import Generator
 import logging
@@ -23,7 +25,8 @@ def get_connection(db_path: str = None) -> sqlite3.Connection:
     Crée une connexion à la base de données.
     
     Args:
-        db_path: Chemin vers le fichier SQLite (optionnel)
+        db_path: Chemin vers le fichier SQLite, ou URI SQLite "file:..."
+                 (ex: "file:aftt_test?mode=memory&cache=shared" pour les tests)
     
     Returns:
         Connection SQLite configurée
@@ -31,36 +34,132 @@ def get_connection(db_path: str = None) -> sqlite3.Connection:
     if db_path is None:
         db_path = get_db_path()
     
-    # Créer le dossier si nécessaire
-    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    is_uri = db_path.startswith('file:')
+    in_memory = db_path == ':memory:' or 'mode=memory' in db_path
+    if not is_uri and not in_memory:
+        # Créer le dossier si nécessaire
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
     
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn = sqlite3.connect(db_path, uri=is_uri, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
     conn.execute("PRAGMA foreign_keys = ON")  # Activer les clés étrangères
-    conn.execute("PRAGMA journal_mode = WAL")  # Mode WAL pour éviter les blocages
+    if not in_memory:
+        # Sans objet pour une base en mémoire (pas de journal sur disque)
+        conn.execute("PRAGMA journal_mode = WAL")  # Mode WAL pour éviter les blocages
+        conn.execute("PRAGMA synchronous = NORMAL")  # Suffisant en WAL, moins de fsync par commit
+    conn.execute("PRAGMA temp_store = MEMORY")  # Tables temporaires (tris, GROUP BY) en RAM
+    conn.execute("PRAGMA cache_size = -65536")  # Cache de pages de 64 Mio
     conn.execute("PRAGMA busy_timeout = 30000")  # Timeout 30s si DB occupée
     
     return conn
 
 
+# Connexions réutilisées par get_db() : une par thread et par base, ouvertes à la
+# demande et gardées jusqu'à la fin du process (ou jusqu'à close_all_connections)
+_local = threading.local()
+_open_connections: list = []
+_open_connections_lock = threading.Lock()
+_generation = 0
+# Connexions dont le thread est dans un bloc get_db() : close_all_connections()
+# ne les ferme pas, leur thread les ferme à la sortie du bloc
+_busy_connections: set = set()
+
+
+def _get_thread_connection() -> sqlite3.Connection:
+    """Connexion du thread courant à la base configurée (créée au premier appel)."""
+    db_path = get_db_path()
+    key = (db_path, _generation)
+    if getattr(_local, 'key', None) == key:
+        return _local.conn
+    
+    conn = get_connection(db_path)
+    with _open_connections_lock:
+        # Fermer au passage les connexions des threads terminés (pools éphémères)
+        dead = [(t, c) for t, c in _open_connections if not t.is_alive()]
+        for entry in dead:
+            _open_connections.remove(entry)
+            entry[1].close()
+        _open_connections.append((threading.current_thread(), conn))
+    _local.conn = conn
+    _local.key = key
+    return conn
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_all_connections() -> None:
+    """
+    Ferme les connexions réutilisées ; les threads en rouvriront au besoin.
+    Une connexion en cours d'utilisation (thread dans un bloc get_db()) n'est pas
+    fermée ici : elle est seulement retirée, et son thread la ferme en sortant du bloc.
+    """
+    global _generation
+    with _open_connections_lock:
+        _generation += 1
+        idle = [entry for entry in _open_connections if entry[1] not in _busy_connections]
+        for entry in idle:
+            _open_connections.remove(entry)
+    for _, conn in idle:
+        _close_quietly(conn)
+
+
+def _release_thread_connection(conn: sqlite3.Connection) -> None:
+    """Fin du bloc get_db() le plus externe : ferme la connexion si elle a été
+    retirée entre-temps par close_all_connections()."""
+    with _open_connections_lock:
+        _busy_connections.discard(conn)
+        retired = _local.key[1] != _generation
+        if retired:
+            _open_connections[:] = [entry for entry in _open_connections if entry[1] is not conn]
+    if retired:
+        _local.key = None
+        _close_quietly(conn)
+
+
+atexit.register(close_all_connections)
+
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
     """
     Context manager pour obtenir une connexion à la base.
+    La connexion du thread est réutilisée d'un appel à l'autre (pas de close) ;
+    seul le bloc le plus externe valide (commit) ou annule (rollback) la transaction.
+    
+    Blocs imbriqués : un `with get_db()` ouvert dans un autre bloc get_db() du même
+    thread partage sa connexion et sa transaction. Il ne valide rien lui-même :
+    ses écritures sont validées par le commit du bloc externe, et annulées avec
+    lui si le bloc externe lève une exception. (Quand chaque bloc ouvrait sa propre
+    connexion, un bloc interne validait seul.) Pour une écriture qui doit être
+    validée indépendamment du bloc englobant, utiliser get_connection() directement.
     
     Usage:
         with get_db() as db:
             cursor = db.execute("SELECT * FROM clubs")
     """
-    conn = get_connection()
+    conn = _get_thread_connection()
+    depth = getattr(_local, 'depth', 0)
+    if depth == 0:
+        with _open_connections_lock:
+            _busy_connections.add(conn)
+    _local.depth = depth + 1
     try:
         yield conn
-        conn.commit()
+        if depth == 0:
+            conn.commit()
     except Exception as e:
-        conn.rollback()
+        if depth == 0:
+            conn.rollback()
         raise e
     finally:
-        conn.close()
+        _local.depth = depth
+        if depth == 0:
+            _release_thread_connection(conn)
 
 
 def init_database(db_path: str = None) -> None:
@@ -180,6 +279,7 @@ def reset_database(db_path: str = None) -> None:
     if db_path is None:
         db_path = get_db_path()
     
+    close_all_connections()
     if os.path.exists(db_path):
         os.remove(db_path)
         logger.info(f"Base de données supprimée: {db_path}")
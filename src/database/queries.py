@@ -11,9 +11,7 @@ from .models import Club, Player, Match, PlayerStats, InterclubsDivision, Interc
 # CLUBS
 # =============================================================================
 
-def insert_club(club: Dict[str, Any], db: sqlite3.Connection = None) -> None:
-    """Insere ou met a jour un club (upsert par code). Les champs NULL ne remplacent pas les valeurs existantes."""
-    sql = """
+_INSERT_CLUB_SQL = """
     INSERT INTO clubs (code, name, province, full_name, email, phone, status, 
                        website, has_shower, venue_name, venue_address, venue_phone,
                        venue_pmr, venue_remarks, teams_men, teams_women, teams_youth,
@@ -43,43 +41,62 @@ def insert_club(club: Dict[str, Any], db: sqlite3.Connection = None) -> None:
         label = COALESCE(excluded.label, clubs.label),
         palette = COALESCE(excluded.palette, clubs.palette),
         updated_at = CURRENT_TIMESTAMP
-    """
-    
-    # Valeurs par défaut - convertir les chaînes vides en None pour que COALESCE fonctionne
-    def normalize(val):
-        """Convertit les chaînes vides en None."""
-        if val is None or (isinstance(val, str) and val.strip() == ''):
-            return None
-        return val
-    
-    data = {
+"""
+
+
+def _normalize_empty(val):
+    """Convertit les chaînes vides en None (pour que COALESCE garde l'existant)."""
+    if val is None or (isinstance(val, str) and val.strip() == ''):
+        return None
+    return val
+
+
+def _club_row(club: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         'code': club.get('code'),
-        'name': normalize(club.get('name')),
-        'province': normalize(club.get('province')),
-        'full_name': normalize(club.get('full_name')),
-        'email': normalize(club.get('email')),
-        'phone': normalize(club.get('phone')),
-        'status': normalize(club.get('status')),
-        'website': normalize(club.get('website')),
+        'name': _normalize_empty(club.get('name')),
+        'province': _normalize_empty(club.get('province')),
+        'full_name': _normalize_empty(club.get('full_name')),
+        'email': _normalize_empty(club.get('email')),
+        'phone': _normalize_empty(club.get('phone')),
+        'status': _normalize_empty(club.get('status')),
+        'website': _normalize_empty(club.get('website')),
         'has_shower': club.get('has_shower'),
-        'venue_name': normalize(club.get('venue_name')),
-        'venue_address': normalize(club.get('venue_address')),
-        'venue_phone': normalize(club.get('venue_phone')),
+        'venue_name': _normalize_empty(club.get('venue_name')),
+        'venue_address': _normalize_empty(club.get('venue_address')),
+        'venue_phone': _normalize_empty(club.get('venue_phone')),
         'venue_pmr': club.get('venue_pmr'),
-        'venue_remarks': normalize(club.get('venue_remarks')),
+        'venue_remarks': _normalize_empty(club.get('venue_remarks')),
         'teams_men': club.get('teams_men', 0),
         'teams_women': club.get('teams_women', 0),
         'teams_youth': club.get('teams_youth', 0),
         'teams_veterans': club.get('teams_veterans', 0),
-        'label': normalize(club.get('label')),
-        'palette': normalize(club.get('palette')),
+        'label': _normalize_empty(club.get('label')),
+        'palette': _normalize_empty(club.get('palette')),
     }
-    
+
+
+def insert_club(club: Dict[str, Any], db: sqlite3.Connection = None) -> None:
+    """Insere ou met a jour un club (upsert par code). Les champs NULL ne remplacent pas les valeurs existantes."""
+    data = _club_row(club)
     if db:
-        db.execute(sql, data)
+        db.execute(_INSERT_CLUB_SQL, data)
     else:
         with get_db() as conn:
-            conn.execute(sql, data)
+            conn.execute(_INSERT_CLUB_SQL, data)
+
+
+def insert_clubs_batch(clubs: List[Dict[str, Any]], db: sqlite3.Connection = None) -> int:
+    """Insère ou met à jour un batch de clubs en une seule transaction. Retourne le nombre inséré."""
+    if not clubs:
+        return 0
+    rows = [_club_row(club) for club in clubs]
+    if db:
+        db.executemany(_INSERT_CLUB_SQL, rows)
+    else:
+        with get_db() as conn:
+            conn.executemany(_INSERT_CLUB_SQL, rows)
+    return len(rows)
 
 
 def get_all_clubs(province: str = None, limit: int = None, offset: int = 0) -> List[Dict]:
@@ -121,9 +138,7 @@ def get_provinces() -> List[str]:
 # PLAYERS
 # =============================================================================
 
-def insert_player(player: Dict[str, Any], db: sqlite3.Connection = None) -> None:
-    """Insere ou met a jour un joueur (upsert par licence). Gere fiches masculine et feminine."""
-    sql = """
+_INSERT_PLAYER_SQL = """
     INSERT INTO players (licence, name, club_code, ranking, category, points_start,
                          points_current, ranking_position, total_wins, total_losses,
                          women_ranking, women_points_start, women_points_current, women_total_wins,
@@ -149,9 +164,11 @@ def insert_player(player: Dict[str, Any], db: sqlite3.Connection = None) -> None
         women_total_losses = COALESCE(excluded.women_total_losses, players.women_total_losses),
         last_update = COALESCE(excluded.last_update, players.last_update),
         updated_at = CURRENT_TIMESTAMP
-    """
-    
-    data = {
+"""
+
+
+def _player_row(player: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         'licence': player.get('licence'),
         'name': player.get('name'),
         'club_code': player.get('club_code'),
@@ -169,12 +186,29 @@ def insert_player(player: Dict[str, Any], db: sqlite3.Connection = None) -> None
         'women_total_losses': player.get('women_total_losses', 0),
         'last_update': player.get('last_update'),
     }
-    
+
+
+def insert_player(player: Dict[str, Any], db: sqlite3.Connection = None) -> None:
+    """Insere ou met a jour un joueur (upsert par licence). Gere fiches masculine et feminine."""
+    data = _player_row(player)
     if db:
-        db.execute(sql, data)
+        db.execute(_INSERT_PLAYER_SQL, data)
     else:
         with get_db() as conn:
-            conn.execute(sql, data)
+            conn.execute(_INSERT_PLAYER_SQL, data)
+
+
+def insert_players_batch(players: List[Dict[str, Any]], db: sqlite3.Connection = None) -> int:
+    """Insère ou met à jour un batch de joueurs en une seule transaction. Retourne le nombre inséré."""
+    if not players:
+        return 0
+    rows = [_player_row(player) for player in players]
+    if db:
+        db.executemany(_INSERT_PLAYER_SQL, rows)
+    else:
+        with get_db() as conn:
+            conn.executemany(_INSERT_PLAYER_SQL, rows)
+    return len(rows)
 
 
 def get_all_players(
@@ -689,9 +723,7 @@ def get_active_players_count() -> int:
 # TOURNAMENTS
 # =============================================================================
 
-def insert_tournament(tournament: Dict[str, Any], db: sqlite3.Connection = None) -> None:
-    """Insère ou met à jour un tournoi."""
-    sql = """
+_INSERT_TOURNAMENT_SQL = """
     INSERT INTO tournaments (t_id, name, level, date_start, date_end, reference, series_count)
     VALUES (:t_id, :name, :level, :date_start, :date_end, :reference, :series_count)
     ON CONFLICT(t_id) DO UPDATE SET
@@ -702,9 +734,11 @@ def insert_tournament(tournament: Dict[str, Any], db: sqlite3.Connection = None)
         reference = COALESCE(excluded.reference, tournaments.reference),
         series_count = COALESCE(excluded.series_count, tournaments.series_count),
         updated_at = CURRENT_TIMESTAMP
-    """
-    
-    data = {
+"""
+
+
+def _tournament_row(tournament: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         't_id': tournament.get('t_id'),
         'name': tournament.get('name'),
         'level': tournament.get('level'),
@@ -713,12 +747,29 @@ def insert_tournament(tournament: Dict[str, Any], db: sqlite3.Connection = None)
         'reference': tournament.get('reference'),
         'series_count': tournament.get('series_count', 0),
     }
-    
+
+
+def insert_tournament(tournament: Dict[str, Any], db: sqlite3.Connection = None) -> None:
+    """Insère ou met à jour un tournoi."""
+    data = _tournament_row(tournament)
     if db:
-        db.execute(sql, data)
+        db.execute(_INSERT_TOURNAMENT_SQL, data)
     else:
         with get_db() as conn:
-            conn.execute(sql, data)
+            conn.execute(_INSERT_TOURNAMENT_SQL, data)
+
+
+def insert_tournaments_batch(tournaments: List[Dict[str, Any]], db: sqlite3.Connection = None) -> int:
+    """Insère ou met à jour un batch de tournois en une seule transaction. Retourne le nombre inséré."""
+    if not tournaments:
+        return 0
+    rows = [_tournament_row(item) for item in tournaments]
+    if db:
+        db.executemany(_INSERT_TOURNAMENT_SQL, rows)
+    else:
+        with get_db() as conn:
+            conn.executemany(_INSERT_TOURNAMENT_SQL, rows)
+    return len(rows)
 
 
 def get_tournament(t_id: int) -> Optional[Dict]:
@@ -788,9 +839,7 @@ def get_tournaments_count() -> int:
 # TOURNAMENT SERIES
 # =============================================================================
 
-def insert_tournament_series(series: Dict[str, Any], db: sqlite3.Connection = None) -> None:
-    """Insère ou met à jour une série de tournoi."""
-    sql = """
+_INSERT_TOURNAMENT_SERIES_SQL = """
     INSERT INTO tournament_series (tournament_id, series_name, date, time, inscriptions_count, inscriptions_max)
     VALUES (:tournament_id, :series_name, :date, :time, :inscriptions_count, :inscriptions_max)
     ON CONFLICT(tournament_id, series_name) DO UPDATE SET
@@ -798,9 +847,11 @@ def insert_tournament_series(series: Dict[str, Any], db: sqlite3.Connection = No
         time = COALESCE(excluded.time, tournament_series.time),
         inscriptions_count = COALESCE(excluded.inscriptions_count, tournament_series.inscriptions_count),
         inscriptions_max = COALESCE(excluded.inscriptions_max, tournament_series.inscriptions_max)
-    """
-    
-    data = {
+"""
+
+
+def _tournament_series_row(series: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         'tournament_id': series.get('tournament_id'),
         'series_name': series.get('series_name'),
         'date': series.get('date'),
@@ -808,12 +859,29 @@ def insert_tournament_series(series: Dict[str, Any], db: sqlite3.Connection = No
         'inscriptions_count': series.get('inscriptions_count', 0),
         'inscriptions_max': series.get('inscriptions_max', 0),
     }
-    
+
+
+def insert_tournament_series(series: Dict[str, Any], db: sqlite3.Connection = None) -> None:
+    """Insère ou met à jour une série de tournoi."""
+    data = _tournament_series_row(series)
     if db:
-        db.execute(sql, data)
+        db.execute(_INSERT_TOURNAMENT_SERIES_SQL, data)
     else:
         with get_db() as conn:
-            conn.execute(sql, data)
+            conn.execute(_INSERT_TOURNAMENT_SERIES_SQL, data)
+
+
+def insert_tournament_series_batch(series_list: List[Dict[str, Any]], db: sqlite3.Connection = None) -> int:
+    """Insère ou met à jour un batch de séries en une seule transaction. Retourne le nombre inséré."""
+    if not series_list:
+        return 0
+    rows = [_tournament_series_row(item) for item in series_list]
+    if db:
+        db.executemany(_INSERT_TOURNAMENT_SERIES_SQL, rows)
+    else:
+        with get_db() as conn:
+            conn.executemany(_INSERT_TOURNAMENT_SERIES_SQL, rows)
+    return len(rows)
 
 
 def get_tournament_series(tournament_id: int) -> List[Dict]:
@@ -832,18 +900,18 @@ def get_tournament_series(tournament_id: int) -> List[Dict]:
 # TOURNAMENT INSCRIPTIONS
 # =============================================================================
 
-def insert_tournament_inscription(inscription: Dict[str, Any], db: sqlite3.Connection = None) -> None:
-    """Insère ou met à jour une inscription à un tournoi."""
-    sql = """
+_INSERT_TOURNAMENT_INSCRIPTION_SQL = """
     INSERT INTO tournament_inscriptions (tournament_id, series_name, player_licence, player_name, player_club, player_ranking)
     VALUES (:tournament_id, :series_name, :player_licence, :player_name, :player_club, :player_ranking)
     ON CONFLICT(tournament_id, series_name, player_licence) DO UPDATE SET
         player_name = COALESCE(excluded.player_name, tournament_inscriptions.player_name),
         player_club = COALESCE(excluded.player_club, tournament_inscriptions.player_club),
         player_ranking = COALESCE(excluded.player_ranking, tournament_inscriptions.player_ranking)
-    """
-    
-    data = {
+"""
+
+
+def _tournament_inscription_row(inscription: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         'tournament_id': inscription.get('tournament_id'),
         'series_name': inscription.get('series_name'),
         'player_licence': inscription.get('player_licence'),
@@ -851,12 +919,29 @@ def insert_tournament_inscription(inscription: Dict[str, Any], db: sqlite3.Conne
         'player_club': inscription.get('player_club'),
         'player_ranking': inscription.get('player_ranking'),
     }
-    
+
+
+def insert_tournament_inscription(inscription: Dict[str, Any], db: sqlite3.Connection = None) -> None:
+    """Insère ou met à jour une inscription à un tournoi."""
+    data = _tournament_inscription_row(inscription)
     if db:
-        db.execute(sql, data)
+        db.execute(_INSERT_TOURNAMENT_INSCRIPTION_SQL, data)
     else:
         with get_db() as conn:
-            conn.execute(sql, data)
+            conn.execute(_INSERT_TOURNAMENT_INSCRIPTION_SQL, data)
+
+
+def insert_tournament_inscriptions_batch(inscriptions: List[Dict[str, Any]], db: sqlite3.Connection = None) -> int:
+    """Insère ou met à jour un batch d'inscriptions en une seule transaction. Retourne le nombre inséré."""
+    if not inscriptions:
+        return 0
+    rows = [_tournament_inscription_row(item) for item in inscriptions]
+    if db:
+        db.executemany(_INSERT_TOURNAMENT_INSCRIPTION_SQL, rows)
+    else:
+        with get_db() as conn:
+            conn.executemany(_INSERT_TOURNAMENT_INSCRIPTION_SQL, rows)
+    return len(rows)
 
 
 def get_tournament_inscriptions(tournament_id: int, series_name: str = None) -> List[Dict]:
@@ -893,16 +978,16 @@ def get_player_tournament_inscriptions(player_licence: str) -> List[Dict]:
 # TOURNAMENT RESULTS
 # =============================================================================
 
-def insert_tournament_result(result: Dict[str, Any], db: sqlite3.Connection = None) -> None:
-    """Insère un résultat de tournoi."""
-    sql = """
+_INSERT_TOURNAMENT_RESULT_SQL = """
     INSERT INTO tournament_results (tournament_id, series_name, player1_licence, player1_name, 
                                     player2_licence, player2_name, score, winner_licence, round)
     VALUES (:tournament_id, :series_name, :player1_licence, :player1_name,
             :player2_licence, :player2_name, :score, :winner_licence, :round)
-    """
-    
-    data = {
+"""
+
+
+def _tournament_result_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         'tournament_id': result.get('tournament_id'),
         'series_name': result.get('series_name'),
         'player1_licence': result.get('player1_licence'),
@@ -913,12 +998,29 @@ def insert_tournament_result(result: Dict[str, Any], db: sqlite3.Connection = No
         'winner_licence': result.get('winner_licence'),
         'round': result.get('round'),
     }
-    
+
+
+def insert_tournament_result(result: Dict[str, Any], db: sqlite3.Connection = None) -> None:
+    """Insère un résultat de tournoi."""
+    data = _tournament_result_row(result)
     if db:
-        db.execute(sql, data)
+        db.execute(_INSERT_TOURNAMENT_RESULT_SQL, data)
     else:
         with get_db() as conn:
-            conn.execute(sql, data)
+            conn.execute(_INSERT_TOURNAMENT_RESULT_SQL, data)
+
+
+def insert_tournament_results_batch(results: List[Dict[str, Any]], db: sqlite3.Connection = None) -> int:
+    """Insère un batch de résultats en une seule transaction. Retourne le nombre inséré."""
+    if not results:
+        return 0
+    rows = [_tournament_result_row(item) for item in results]
+    if db:
+        db.executemany(_INSERT_TOURNAMENT_RESULT_SQL, rows)
+    else:
+        with get_db() as conn:
+            conn.executemany(_INSERT_TOURNAMENT_RESULT_SQL, rows)
+    return len(rows)
 
 
 def get_tournament_results(tournament_id: int, series_name: str = None) -> List[Dict]:
@@ -951,12 +1053,15 @@ def get_player_tournament_results(player_licence: str) -> List[Dict]:
         return [dict(row) for row in cursor.fetchall()]
 
 
-def delete_tournament_data(tournament_id: int) -> None:
+def delete_tournament_data(tournament_id: int, db: sqlite3.Connection = None) -> None:
     """Supprime toutes les données d'un tournoi (séries, inscriptions, résultats)."""
-    with get_db() as db:
-        db.execute("DELETE FROM tournament_results WHERE tournament_id = ?", (tournament_id,))
-        db.execute("DELETE FROM tournament_inscriptions WHERE tournament_id = ?", (tournament_id,))
-        db.execute("DELETE FROM tournament_series WHERE tournament_id = ?", (tournament_id,))
+    if db is None:
+        with get_db() as conn:
+            delete_tournament_data(tournament_id, conn)
+        return
+    db.execute("DELETE FROM tournament_results WHERE tournament_id = ?", (tournament_id,))
+    db.execute("DELETE FROM tournament_inscriptions WHERE tournament_id = ?", (tournament_id,))
+    db.execute("DELETE FROM tournament_series WHERE tournament_id = ?", (tournament_id,))
 
 
 # =============================================================================
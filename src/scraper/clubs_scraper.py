@@ -7,12 +7,13 @@ depuis le site data.aftt.be
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import re
 from dataclasses import dataclass, asdict
 from typing import List, Optional
 import logging
 
+from src.scraper.json_export import save_json
+
 logger = logging.getLogger(__name__)
 
 # URL de la page des classements AFTT
@@ -165,8 +166,7 @@ def save_clubs_to_json(clubs: List[Club], filepath: str = "data/clubs.json") ->
     
     clubs_data = [club.to_dict() for club in clubs]
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(clubs_data, f, ensure_ascii=False, indent=2)
+    save_json(clubs_data, filepath)
     
     logger.info(f"Clubs sauvegardés dans : {filepath}")
 
@@ -0,0 +1,51 @@
+"""
+Écriture des exports JSON du dossier data/ (clubs, membres, joueurs).
+"""
+import gzip
+import json
+import os
+import threading
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : seules les copies .gz sont alors écrites
+    brotli = None
+
+
+def save_json(data: Any, filepath: str) -> None:
+    """
+    Écrit data en JSON (UTF-8, indenté) dans filepath, accompagné de copies
+    précompressées filepath.gz (et filepath.br si brotli est installé).
+    web/server.py sert ces copies telles quelles selon l'en-tête Accept-Encoding :
+    la compression est faite une fois ici, pas à chaque requête.
+    
+    Chaque fichier est écrit dans un fichier temporaire puis renommé (os.replace) :
+    un lecteur ne voit jamais de fichier tronqué.
+    """
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    content = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    versions = [(filepath, content), (filepath + '.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        versions.append((filepath + '.br', brotli.compress(content)))
+    
+    # Les temporaires sont écrits dans l'ordre JSON puis copies : leur mtime (conservé
+    # par os.replace) n'est donc jamais antérieur à celui du JSON. Le JSON est renommé
+    # en premier : tant que les copies ne sont pas remplacées (ou après un arrêt
+    # brutal), elles sont plus anciennes que lui et le serveur les ignore.
+    tmp_paths = []
+    try:
+        for path, payload in versions:
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            tmp_paths.append(tmp_path)
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+        for (path, _), tmp_path in zip(versions, tmp_paths):
+            os.replace(tmp_path, path)
+    finally:
+        for tmp_path in tmp_paths:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
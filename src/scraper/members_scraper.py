@@ -16,6 +16,8 @@ from typing import List, Optional
 import logging
 import os
 
+from src.scraper.json_export import save_json
+
 logger = logging.getLogger(__name__)
 
 # URL de la page de l'annuaire des membres
@@ -360,8 +362,7 @@ def save_members_to_json(members: dict, club_code: str, filepath: str = None) ->
     
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(members, f, ensure_ascii=False, indent=2)
+    save_json(members, filepath)
     
     logger.info(f"Membres sauvegardes dans : {filepath}")
     return filepath
@@ -9,12 +9,16 @@ Source: https://data.aftt.be/tools/fiche.php
 
 import requests
 from bs4 import BeautifulSoup
-import json
 import re
 from dataclasses import dataclass, asdict, field
 from typing import List, Optional, Dict
 import logging
 import os
+import time
+
+from src.config import SCRAPE_CACHE_DIR, SCRAPE_CACHE_TTL, SCRAPE_CACHE_ENABLED
+
+from src.scraper.json_export import save_json
 
 logger = logging.getLogger(__name__)
 
@@ -94,20 +98,76 @@ class PlayerInfo:
         return asdict(self)
 
 
+def _is_ratio(value: str) -> bool:
+    """Vérifie qu'une cellule ratio ("66.7%", "50") est numérique."""
+    return value.replace('%', '').replace('.', '', 1).isdigit()
+
+
+# Lignes du tableau de stats: (clé, mots-clés de la 1ère cellule, validation, conversion)
+_STATS_ROW_HANDLERS = (
+    ('wins', ('victoire', 'win'), str.isdigit, int),
+    ('losses', ('faite', 'loss'), str.isdigit, int),
+    ('ratio', ('ratio', '%'), _is_ratio, lambda v: float(v.replace('%', ''))),
+)
+
+
+def _get_cache_path(licence: str, women: bool) -> Optional[str]:
+    """
+    Chemin du cache disque d'une fiche: cache/{fiche}/{licence}.html
+    Un seul fichier par fiche, réécrit à chaque récupération : la fraîcheur est
+    gérée par le mtime (SCRAPE_CACHE_TTL), le cache ne grossit pas d'un jour à l'autre.
+    Retourne None si le cache est désactivé (AFTT_NO_CACHE=1) ou la licence invalide.
+    """
+    if not SCRAPE_CACHE_ENABLED or not licence.isdigit():
+        return None
+    fiche = 'fiche_women' if women else 'fiche'
+    return os.path.join(SCRAPE_CACHE_DIR, fiche, f"{licence}.html")
+
+
+def _read_cached_page(cache_path: str) -> Optional[str]:
+    """Lit une fiche en cache si elle existe et n'a pas expiré."""
+    try:
+        if time.time() - os.path.getmtime(cache_path) > SCRAPE_CACHE_TTL:
+            return None
+        with open(cache_path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    except OSError:
+        return None
+
+
+def _write_cached_page(cache_path: str, content: bytes) -> None:
+    """Écrit une fiche en cache de façon atomique (fichier temporaire + os.replace)."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Impossible d'écrire le cache {cache_path}: {e}")
+
+
 def fetch_player_page(licence: str, women: bool = False, max_retries: int = 3) -> str:
     """
     Récupère la fiche d'un joueur via GET avec licenceID.
     Inclut des retries avec délai exponentiel en cas d'échec.
+    Les pages sont mises en cache sur disque (AFTT_CACHE_TTL, désactivable via AFTT_NO_CACHE=1).
     
     Args:
         licence: Numéro de licence du joueur
         women: Si True, récupère la fiche féminine (fiche_women.php)
         max_retries: Nombre maximum de tentatives
     """
-    import time
-    
     url = AFTT_FICHE_WOMEN_URL if women else AFTT_FICHE_URL
     fiche_type = "feminine" if women else "masculine"
+
+    cache_path = _get_cache_path(licence, women)
+    if cache_path:
+        cached = _read_cached_page(cache_path)
+        if cached is not None:
+            logger.info(f"Fiche {fiche_type} du joueur {licence} lue depuis le cache")
+            return cached
+
     logger.info(f"Recuperation de la fiche {fiche_type} du joueur {licence}...")
 
     # Utiliser GET avec licenceID
@@ -124,9 +184,12 @@ def fetch_player_page(licence: str, women: bool = False, max_retries: int = 3) -
 
             response = _session.get(url, params=params, timeout=30)
             response.raise_for_status()
-            response.encoding = 'utf-8'
             logger.info(f"Page recuperee avec succes (status: {response.status_code})")
-            return response.text
+            if cache_path:
+                _write_cached_page(cache_path, response.content)
+            # La fiche est toujours servie en UTF-8 : décoder directement les octets
+            # évite la détection d'encodage (charset_normalizer) de response.text
+            return response.content.decode('utf-8', errors='replace')
         except requests.RequestException as e:
             last_error = e
             logger.warning(f"Tentative {attempt + 1}/{max_retries} echouee: {e}")
@@ -221,27 +284,15 @@ def extract_player_info(html_content: str, licence: str) -> PlayerInfo:
             # Premiere ligne = headers (classements)
             if not headers and len(cell_texts) > 1:
                 headers = cell_texts[1:]  # Skip first empty cell
-            elif 'victoire' in first_cell or 'win' in first_cell:
-                for i, val in enumerate(cell_texts[1:]):
-                    if i < len(headers):
-                        try:
-                            stats_data['wins'][headers[i]] = int(val)
-                        except ValueError:
-                            pass
-            elif 'faite' in first_cell or 'loss' in first_cell:
-                for i, val in enumerate(cell_texts[1:]):
-                    if i < len(headers):
-                        try:
-                            stats_data['losses'][headers[i]] = int(val)
-                        except ValueError:
-                            pass
-            elif 'ratio' in first_cell or '%' in first_cell:
-                for i, val in enumerate(cell_texts[1:]):
-                    if i < len(headers):
-                        try:
-                            stats_data['ratio'][headers[i]] = float(val.replace('%', ''))
-                        except ValueError:
-                            pass
+                continue
+            
+            for kind, keywords, is_valid, convert in _STATS_ROW_HANDLERS:
+                if any(k in first_cell for k in keywords):
+                    values = stats_data[kind]
+                    for ranking, val in zip(headers, cell_texts[1:]):
+                        if is_valid(val):
+                            values[ranking] = convert(val)
+                    break
         
         # Construire la liste des stats
         for ranking in headers:
@@ -258,18 +309,20 @@ def extract_player_info(html_content: str, licence: str) -> PlayerInfo:
     # 5. Evolution des points (donnees du graphique)
     scripts = soup.find_all('script')
     for script in scripts:
-        text = script.get_text()
-        if 'data' in text.lower():
-            # Chercher un array de nombres
-            arrays = re.findall(r'data:\s*\[([\d.,\s]+)\]', text)
-            for arr in arrays:
-                try:
-                    values = [float(v.strip()) for v in arr.split(',') if v.strip()]
-                    if len(values) > 1 and all(100 < v < 3000 for v in values):
-                        player.points_evolution = values
-                        break
-                except ValueError:
-                    continue
+        # .string renvoie directement le noeud texte (cas usuel des scripts inline)
+        text = script.string
+        if not text or 'data:' not in text:
+            continue
+        # Chercher un array de nombres
+        arrays = re.findall(r'data:\s*\[([\d.,\s]+)\]', text)
+        for arr in arrays:
+            try:
+                values = [float(v.strip()) for v in arr.split(',') if v.strip()]
+                if len(values) > 1 and all(100 < v < 3000 for v in values):
+                    player.points_evolution = values
+                    break
+            except ValueError:
+                continue
     
     # 6. Matchs par journée (groupés par card-header)
     # Structure: card avec header (date - division - club) et body contenant les match-cards
@@ -416,8 +469,7 @@ def save_player_to_json(player_data: dict, filepath: str = None) -> str:
     
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(player_data, f, ensure_ascii=False, indent=2)
+    save_json(player_data, filepath)
     
     logger.info(f"Joueur sauvegarde dans : {filepath}")
     return filepath
@@ -11,23 +11,95 @@ contrairement à l'annuaire qui ne contient que les joueurs actifs.
 Utilise Playwright pour rendre le JavaScript.
 """
 
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+import lxml.etree
+import lxml.html
+import requests
 import re
 import logging
 import asyncio
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
 from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 # Pattern de validation pour les codes club (ex: H004, BW023)
 CLUB_CODE_PATTERN = re.compile(r'^[A-Z]{1,3}\d{2,4}$')
 
+# Patterns d'extraction de la licence, compilés une fois (utilisés à chaque ligne)
+_RE_LICENCE_ID = re.compile(r'licenceID=(\d+)')
+_RE_HREF_LICENCE = re.compile(r'(\d{6})')
+_RE_SIX_DIGITS = re.compile(r'\b(\d{6})\b')
+
 logger = logging.getLogger(__name__)
 
 RANKING_URL = "https://data.aftt.be/ranking/clubs.php"
 
+# Session HTTP pour le chemin rapide (sans navigateur)
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'fr-BE,fr;q=0.9,en;q=0.8',
+})
+
+# Ressources inutiles pour lire la datatable (seuls document, scripts et XHR comptent)
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Sélecteurs et script partagés par les versions sync et async du scraping navigateur
+_CLUB_OPTIONS_SELECTOR = '#clubSelect option'
+_DATATABLE_ROWS_SELECTOR = '#datatable-messieurs tbody tr, #datatable-dames tbody tr'
+_SELECT_CLUB_JS = """
+    (clubCode) => {
+        const select = document.getElementById('clubSelect');
+        if (select) {
+            select.value = clubCode;
+            const event = new Event('change', { bubbles: true });
+            select.dispatchEvent(event);
+            if (select.form) {
+                select.form.submit();
+            }
+        }
+    }
+"""
+_SELECTED_CLUB_JS = "() => document.getElementById('clubSelect')?.value"
+# Lignes d'un datatable extraites directement du DOM (pas de re-parsing HTML) :
+# textes des 7 colonnes + de quoi retrouver la licence dans la cellule Action
+_DATATABLE_ROWS_JS = """
+    (tableId) => {
+        const table = document.getElementById(tableId);
+        if (!table) {
+            return [];
+        }
+        return Array.from(table.querySelectorAll('tr')).slice(1).map(tr => {
+            const cells = Array.from(tr.querySelectorAll(':scope > td'));
+            const action = cells[7];
+            const link = action?.querySelector('a');
+            const input = action?.querySelector('form input[name="licence"]');
+            return {
+                cell_count: cells.length,
+                texts: cells.slice(0, 7).map(td => td.textContent.trim()),
+                href: link ? link.getAttribute('href') || '' : '',
+                form_licence: input ? input.value : '',
+                action_html: action ? action.outerHTML : '',
+                // Dernier recours côté Python si la cellule Action ne donne rien
+                // (inutile quand le formulaire donne directement la licence)
+                row_html: input ? '' : tr.outerHTML,
+            };
+        });
+    }
+"""
+_CONTEXT_OPTIONS = {
+    'java_script_enabled': True,
+    'viewport': {'width': 1280, 'height': 800},
+    'bypass_csp': True,
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class RankingPlayer:
     """Joueur du classement numérique."""
     position: int                    # Position dans le classement (avec inactifs)
@@ -42,17 +114,159 @@ class RankingPlayer:
     is_active: bool = True           # Si le joueur est actif
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            'position': self.position,
+            'position_active': self.position_active,
+            'licence': self.licence,
+            'name': self.name,
+            'ranking': self.ranking,
+            'club_code': self.club_code,
+            'matches': self.matches,
+            'points': self.points,
+            'gender': self.gender,
+            'is_active': self.is_active,
+        }
+
+
+class _BrowserPool:
+    """
+    Garde un navigateur Chromium ouvert entre les appels (le démarrage coûte 1-2s).
+    
+    L'API sync de Playwright est liée au thread qui l'a démarrée : toutes les
+    opérations passent donc par un thread dédié qui possède le navigateur.
+    Chaque scraping utilise son propre contexte, fermé après usage.
+    """
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+
+    def run(self, func, *args):
+        """Exécute func(browser, *args) dans le thread Playwright et renvoie son résultat."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='playwright', daemon=True)
+                self._thread.start()
+        future = Future()
+        self._jobs.put((func, args, future))
+        return future.result()
+
+    def close(self) -> None:
+        """Ferme le navigateur et arrête le thread Playwright."""
+        with self._lock:
+            if self._thread is None:
+                return
+            future = Future()
+            self._jobs.put((None, (), future))
+            self._thread = None
+        future.result(timeout=10)
+
+    def _loop(self) -> None:
+        while True:
+            func, args, future = self._jobs.get()
+            if func is None:
+                self._shutdown()
+                future.set_result(None)
+                return
+            try:
+                future.set_result(func(self._get_browser(), *args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _get_browser(self):
+        if self._browser is None or not self._browser.is_connected():
+            if self._playwright is None:
+                self._playwright = sync_playwright().start()
+            logger.info("Démarrage du navigateur Chromium...")
+            self._browser = self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    def _shutdown(self) -> None:
+        try:
+            if self._browser is not None:
+                self._browser.close()
+            if self._playwright is not None:
+                self._playwright.stop()
+        except Exception as e:
+            logger.debug(f"Erreur à la fermeture du navigateur: {e}")
+        self._browser = None
+        self._playwright = None
+
+
+_browser_pool = _BrowserPool()
+atexit.register(_browser_pool.close)
+
+
+class _AsyncBrowser:
+    """
+    Navigateur Chromium partagé par les scrapings async (API Playwright async).
+    
+    Lancé au premier usage sur la boucle de l'application, fermé par le
+    lifespan FastAPI (close_async_browser). Chaque scraping a son propre contexte.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._lock = None
+
+    async def get(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                logger.info("Démarrage du navigateur Chromium (async)...")
+                self._browser = await self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    async def close(self) -> None:
+        try:
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+        except Exception as e:
+            logger.debug(f"Erreur à la fermeture du navigateur: {e}")
+        self._browser = None
+        self._playwright = None
+        self._lock = None
+
+
+_async_browser = _AsyncBrowser()
+
+
+async def close_async_browser() -> None:
+    """Ferme le navigateur async partagé (à appeler à l'arrêt de l'application)."""
+    await _async_browser.close()
 
 
 async def get_club_ranking_players_async(club_code: str, timeout: int = 30000) -> Dict:
     """
     Version async pour FastAPI.
-    Exécute le scraping synchrone dans un thread séparé pour éviter
-    les problèmes Windows avec asyncio subprocess.
+    
+    Le rendu passe par l'API async de Playwright sur un navigateur partagé :
+    plusieurs clubs peuvent être scrapés en parallèle sans bloquer de thread.
+    Si la boucle ne supporte pas les sous-processus (SelectorEventLoop sous
+    Windows), on se rabat sur la version synchrone dans un thread.
     """
-    # Exécuter la version synchrone dans un thread pool
-    return await asyncio.to_thread(get_club_ranking_players, club_code, timeout)
+    club_code = _normalize_club_code(club_code)
+    logger.info(f"Récupération du classement pour le club {club_code}...")
+    
+    result = await asyncio.to_thread(_get_ranking_fast_or_none, club_code, timeout)
+    if result is not None:
+        return result
+    
+    logger.info(f"Repli Playwright pour le club {club_code}")
+    try:
+        browser = await _async_browser.get()
+    except NotImplementedError:
+        return await asyncio.to_thread(_browser_pool.run, _scrape_club_ranking, club_code, timeout)
+    return await _scrape_club_ranking_async(browser, club_code, timeout)
 
 
 def get_club_ranking_players(club_code: str, timeout: int = 30000) -> Dict:
@@ -66,87 +280,326 @@ def get_club_ranking_players(club_code: str, timeout: int = 30000) -> Dict:
     Returns:
         Dict avec les joueurs messieurs et dames
     """
+    club_code = _normalize_club_code(club_code)
+    logger.info(f"Récupération du classement pour le club {club_code}...")
+    
+    result = _get_ranking_fast_or_none(club_code, timeout)
+    if result is not None:
+        return result
+    
+    # Repli : rendu JavaScript complet via Playwright
+    logger.info(f"Repli Playwright pour le club {club_code}")
+    return _browser_pool.run(_scrape_club_ranking, club_code, timeout)
+
+
+def _normalize_club_code(club_code: str) -> str:
+    """Normalise et valide un code club (ValueError si invalide)."""
     club_code = club_code.strip().upper()
     if not CLUB_CODE_PATTERN.match(club_code):
         raise ValueError(f"Code club invalide: {club_code}. Format attendu: lettres + chiffres (ex: H004)")
-    logger.info(f"Récupération du classement pour le club {club_code}...")
+    return club_code
+
+
+def _get_ranking_fast_or_none(club_code: str, timeout: int) -> Optional[Dict]:
+    """Chemin rapide (HTTP sans navigateur) ; None si Playwright est nécessaire."""
+    try:
+        return get_club_ranking_players_fast(club_code, timeout=timeout / 1000)
+    except requests.RequestException as e:
+        logger.warning(f"Chemin rapide indisponible pour {club_code}: {e}")
+        return None
+    except (lxml.etree.ParserError, lxml.etree.XMLSyntaxError, ValueError) as e:
+        # Corps vide ou illisible : le rendu Playwright prend le relais
+        logger.warning(f"Réponse du chemin rapide illisible pour {club_code}: {e}")
+        return None
+
+
+def get_club_ranking_players_fast(club_code: str, timeout: float = 30) -> Optional[Dict]:
+    """
+    Récupère le classement d'un club sans Playwright.
+    
+    Reproduit la soumission du formulaire de #clubSelect (méthode, action,
+    nom du champ et champs cachés lus sur la page) puis parse la réponse.
+    
+    Returns:
+        Dict comme get_club_ranking_players, ou None si la réponse ne contient
+        aucun joueur (datatable remplie côté client : utiliser Playwright)
+    """
+    response = _session.get(RANKING_URL, timeout=timeout)
+    response.raise_for_status()
+    doc = lxml.html.fromstring(response.content, base_url=RANKING_URL)
+    
+    selects = doc.xpath('//select[@id="clubSelect"]')
+    if not selects:
+        return None
+    select = selects[0]
+    form = select.getparent()
+    while form is not None and form.tag != 'form':
+        form = form.getparent()
+    if form is None:
+        return None
+    
+    # Champs du formulaire tels que le navigateur les enverrait
+    data = dict(form.form_values())
+    data[select.get('name') or 'clubSelect'] = club_code
+    action = form.action or RANKING_URL
+    
+    if (form.method or 'GET').upper() == 'POST':
+        response = _session.post(action, data=data, timeout=timeout)
+    else:
+        response = _session.get(action, params=data, timeout=timeout)
+    response.raise_for_status()
+    
+    result = {'club_code': club_code}
+    result.update(_parse_ranking_html(response.content, club_code))
+    if not result['players_men'] and not result['players_women']:
+        return None
+    
+    logger.info(f"Classement {club_code} récupéré sans navigateur")
+    return result
+
+
+def _parse_ranking_html(html, club_code: str) -> Dict:
+    """Parse les datatables messieurs et dames d'une page de classement."""
+    players = {'players_men': [], 'players_women': []}
+    doc = lxml.html.fromstring(html)
+    
+    # Trouver les datatables messieurs et dames
+    datatable_men = doc.get_element_by_id('datatable-messieurs', None)
+    datatable_women = doc.get_element_by_id('datatable-dames', None)
+    
+    # Parser les joueurs messieurs
+    if datatable_men is not None:
+        players['players_men'] = _parse_datatable(datatable_men, club_code, 'M')
+        logger.info(f"Joueurs messieurs: {len(players['players_men'])}")
+    
+    # Parser les joueuses
+    if datatable_women is not None:
+        players['players_women'] = _parse_datatable(datatable_women, club_code, 'F')
+        logger.info(f"Joueuses: {len(players['players_women'])}")
+    
+    return players
+
+
+def _block_heavy_resources(route) -> None:
+    """Handler page.route : annule images, médias, polices et CSS."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _select_club(page, club_code: str, timeout: int) -> None:
+    """
+    Sélectionne le club (soumission du formulaire) et attend la page rechargée.
+    
+    La navigation est attendue via expect_navigation, armé avant la soumission :
+    sans cette barrière, wait_for_load_state / wait_for_selector peuvent se
+    résoudre sur la page d'avant (déjà chargée, lignes déjà présentes).
+    Même séquence que _select_club_async : modifier les deux ensemble.
+    """
+    logger.info(f"Sélection du club {club_code}...")
+    with page.expect_navigation(wait_until='domcontentloaded', timeout=timeout):
+        page.evaluate(_SELECT_CLUB_JS, club_code)
+    
+    # Page du club chargée : attendre qu'une ligne de datatable soit présente
+    try:
+        page.wait_for_selector(_DATATABLE_ROWS_SELECTOR, timeout=10000)
+    except PlaywrightTimeoutError:
+        # Club sans joueurs classés : on parse quand même ce qui est affiché
+        logger.warning(f"Aucune ligne de classement affichée pour {club_code}")
+
+
+async def _select_club_async(page, club_code: str, timeout: int) -> None:
+    """Équivalent async de _select_club (même barrière de navigation)."""
+    logger.info(f"Sélection du club {club_code}...")
+    async with page.expect_navigation(wait_until='domcontentloaded', timeout=timeout):
+        await page.evaluate(_SELECT_CLUB_JS, club_code)
     
+    try:
+        await page.wait_for_selector(_DATATABLE_ROWS_SELECTOR, timeout=10000)
+    except PlaywrightTimeoutError:
+        logger.warning(f"Aucune ligne de classement affichée pour {club_code}")
+
+
+def _scrape_club_ranking(browser, club_code: str, timeout: int) -> Dict:
+    """Scrape le classement d'un club dans un nouveau contexte du navigateur partagé."""
     result = {
         'club_code': club_code,
         'players_men': [],
         'players_women': [],
     }
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
+    context = browser.new_context(**_CONTEXT_OPTIONS)
+    page = context.new_page()
+    # Le cache HTTP est désactivé quand un route est actif : sans impact ici,
+    # chaque contexte est neuf de toute façon
+    page.route("**/*", _block_heavy_resources)
+    
+    try:
+        # Charger la page
+        logger.info("Chargement de la page ranking...")
+        page.goto(RANKING_URL, timeout=timeout, wait_until='domcontentloaded')
+        page.wait_for_selector(_CLUB_OPTIONS_SELECTOR, state='attached', timeout=10000)
         
-        try:
-            # Charger la page
-            logger.info("Chargement de la page ranking...")
-            page.goto(RANKING_URL, timeout=timeout)
-            page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(2000)
-            
-            # Sélectionner le club via JavaScript
-            logger.info(f"Sélection du club {club_code}...")
-            page.evaluate(f"""
-                () => {{
-                    const select = document.getElementById('clubSelect');
-                    if (select) {{
-                        select.value = '{club_code}';
-                        const event = new Event('change', {{ bubbles: true }});
-                        select.dispatchEvent(event);
-                        if (select.form) {{
-                            select.form.submit();
-                        }}
-                    }}
-                }}
-            """)
-            
-            # Attendre le rechargement
-            page.wait_for_load_state('networkidle')
-            page.wait_for_timeout(3000)
-            
-            # Vérifier que le club est bien sélectionné
-            selected = page.evaluate("() => document.getElementById('clubSelect')?.value")
-            if selected != club_code:
-                logger.warning(f"Club sélectionné: {selected}, attendu: {club_code}")
-            
-            # Récupérer le HTML
-            html = page.content()
-            logger.info(f"HTML récupéré: {len(html)} caractères")
-            
-            # Parser les joueurs
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Trouver les datatables messieurs et dames
-            datatable_men = soup.find(id='datatable-messieurs')
-            datatable_women = soup.find(id='datatable-dames')
-            
-            # Parser les joueurs messieurs
-            if datatable_men:
-                result['players_men'] = _parse_datatable(datatable_men, club_code, 'M')
-                logger.info(f"Joueurs messieurs: {len(result['players_men'])}")
-            
-            # Parser les joueuses
-            if datatable_women:
-                result['players_women'] = _parse_datatable(datatable_women, club_code, 'F')
-                logger.info(f"Joueuses: {len(result['players_women'])}")
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du scraping: {e}")
-            raise
-        finally:
-            browser.close()
+        _select_club(page, club_code, timeout)
+        
+        # Vérifier que le club est bien sélectionné
+        selected = page.evaluate(_SELECTED_CLUB_JS)
+        if selected != club_code:
+            logger.warning(f"Club sélectionné: {selected}, attendu: {club_code}")
+        
+        # Récupérer les lignes des datatables directement depuis le DOM
+        men_rows = page.evaluate(_DATATABLE_ROWS_JS, 'datatable-messieurs')
+        women_rows = page.evaluate(_DATATABLE_ROWS_JS, 'datatable-dames')
+        result.update(_parse_rendered_datatables(men_rows, women_rows, club_code))
+        
+    except Exception as e:
+        logger.error(f"Erreur lors du scraping: {e}")
+        raise
+    finally:
+        # Ne fermer que le contexte : le navigateur reste ouvert pour le prochain club
+        context.close()
     
     return result
 
 
-def _parse_datatable(table, club_code: str, gender: str) -> List[Dict]:
+async def _block_heavy_resources_async(route) -> None:
+    """Handler page.route (API async) : annule images, médias, polices et CSS."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _scrape_club_ranking_async(browser, club_code: str, timeout: int) -> Dict:
+    """Équivalent async de _scrape_club_ranking, dans un contexte isolé."""
+    result = {
+        'club_code': club_code,
+        'players_men': [],
+        'players_women': [],
+    }
+    
+    context = await browser.new_context(**_CONTEXT_OPTIONS)
+    page = await context.new_page()
+    await page.route("**/*", _block_heavy_resources_async)
+    
+    try:
+        await page.goto(RANKING_URL, timeout=timeout, wait_until='domcontentloaded')
+        await page.wait_for_selector(_CLUB_OPTIONS_SELECTOR, state='attached', timeout=10000)
+        
+        await _select_club_async(page, club_code, timeout)
+        
+        selected = await page.evaluate(_SELECTED_CLUB_JS)
+        if selected != club_code:
+            logger.warning(f"Club sélectionné: {selected}, attendu: {club_code}")
+        
+        men_rows = await page.evaluate(_DATATABLE_ROWS_JS, 'datatable-messieurs')
+        women_rows = await page.evaluate(_DATATABLE_ROWS_JS, 'datatable-dames')
+        result.update(_parse_rendered_datatables(men_rows, women_rows, club_code))
+        
+    except Exception as e:
+        logger.error(f"Erreur lors du scraping: {e}")
+        raise
+    finally:
+        await context.close()
+    
+    return result
+
+
+def _licence_from_href(href: str) -> Optional[str]:
+    """Licence d'un lien "Voir fiche" (ex: fiche.php?licenceID=152174)."""
+    licence_match = _RE_LICENCE_ID.search(href)
+    if not licence_match:
+        # Essayer avec un pattern différent
+        licence_match = _RE_HREF_LICENCE.search(href)
+    return licence_match.group(1) if licence_match else None
+
+
+def _licence_from_html(cell_html: str) -> Optional[str]:
+    """Dernier recours : premier nombre à 6 chiffres d'un fragment HTML (cellule Action ou ligne)."""
+    licence_match = _RE_SIX_DIGITS.search(cell_html)
+    return licence_match.group(1) if licence_match else None
+
+
+def _extract_row_licence(row: lxml.html.HtmlElement, cells: List[lxml.html.HtmlElement]) -> Optional[str]:
+    """
+    Extrait la licence d'une ligne : lien "Voir fiche", formulaire, puis HTML de la
+    cellule Action ; en dernier recours, HTML de toute la ligne (lignes sans
+    cellule Action, ou licence placée ailleurs).
     """
-    Parse un datatable de joueurs.
+    licence = None
+    if len(cells) > 7:
+        action_cell = cells[7]
+        hrefs = action_cell.xpath('.//a/@href')
+        if hrefs:
+            licence = _licence_from_href(hrefs[0])
+        
+        # Si pas trouvé dans le lien, chercher dans un formulaire
+        if not licence:
+            values = action_cell.xpath('.//form//input[@name="licence"]/@value')
+            if values:
+                licence = values[0]
+        
+        if not licence:
+            licence = _licence_from_html(lxml.html.tostring(action_cell, encoding='unicode'))
+    
+    if not licence:
+        licence = _licence_from_html(lxml.html.tostring(row, encoding='unicode'))
+    
+    return licence
+
+
+def _parse_ranking_row(cell_texts: List[str], licence: Optional[str],
+                       club_code: str, gender: str) -> Optional[Dict]:
+    """
+    Convertit les textes d'une ligne du datatable en joueur.
+    Ne travaille que sur des str (aucun accès au DOM).
+    Retourne None si le nom ou la licence manque.
+    """
+    # Position avec inactifs
+    position = int(cell_texts[0]) if cell_texts[0].isdecimal() else 0
+    
+    # Position sans inactifs ou "Inactive"
+    is_active = cell_texts[1] != 'Inactive'
+    position_active = int(cell_texts[1]) if cell_texts[1].isdecimal() else None
+    
+    # Nom
+    name = cell_texts[2]
+    
+    # Classement
+    ranking = cell_texts[3]
+    
+    # Matchs
+    matches = int(cell_texts[5]) if cell_texts[5].isdecimal() else 0
+    
+    # Points
+    try:
+        points = float(cell_texts[6])
+    except (ValueError, IndexError):
+        points = 0.0
+    
+    if not name or not licence:
+        return None
+    
+    # Dict construit directement (mêmes clés que RankingPlayer.to_dict()),
+    # sans instancier le dataclass ni passer par asdict
+    return {
+        'position': position,
+        'position_active': position_active,
+        'licence': licence,
+        'name': name,
+        'ranking': ranking,
+        'club_code': club_code,
+        'matches': matches,
+        'points': points,
+        'gender': gender,
+        'is_active': is_active,
+    }
+
+
+def _parse_datatable(table: lxml.html.HtmlElement, club_code: str, gender: str) -> List[Dict]:
+    """
+    Parse un datatable de joueurs (élément lxml).
     
     Format des colonnes:
     0: Pos (position avec inactifs)
@@ -159,86 +612,56 @@ def _parse_datatable(table, club_code: str, gender: str) -> List[Dict]:
     7: Action (lien avec licence)
     """
     players = []
-    rows = table.find_all('tr')
     
-    for row in rows[1:]:  # Skip header
-        cells = row.find_all('td')
-        if len(cells) < 7:
+    # Lignes de données uniquement (hors en-tête, au moins 7 cellules) :
+    # le filtre est fait par lxml, sans branche Python par ligne
+    for row in table.xpath('(.//tr)[position() > 1][count(td) >= 7]'):
+        cells = row.xpath('./td')
+        # Seules les 7 premières colonnes portent du texte utile
+        cell_texts = [c.text_content().strip() for c in cells[:7]]
+        licence = _extract_row_licence(row, cells)
+        player = _parse_ranking_row(cell_texts, licence, club_code, gender)
+        if player:
+            players.append(player)
+    
+    return players
+
+
+def _parse_rendered_datatables(men_rows: List[Dict], women_rows: List[Dict], club_code: str) -> Dict:
+    """Parse les lignes extraites du DOM par _DATATABLE_ROWS_JS (messieurs et dames)."""
+    players = {
+        'players_men': _parse_datatable_from_json(men_rows, club_code, 'M'),
+        'players_women': _parse_datatable_from_json(women_rows, club_code, 'F'),
+    }
+    logger.info(f"Joueurs messieurs: {len(players['players_men'])}")
+    logger.info(f"Joueuses: {len(players['players_women'])}")
+    return players
+
+
+def _parse_datatable_from_json(rows: List[Dict], club_code: str, gender: str) -> List[Dict]:
+    """
+    Parse les lignes d'un datatable déjà extraites du DOM par le navigateur.
+    Même résultat que _parse_datatable, sans parsing HTML.
+    """
+    players = []
+    
+    for row in rows:
+        if row['cell_count'] < 7:
             continue
         
-        try:
-            cell_texts = [c.get_text(strip=True) for c in cells]
-            
-            # Position avec inactifs
-            position = int(cell_texts[0]) if cell_texts[0].isdigit() else 0
-            
-            # Position sans inactifs ou "Inactive"
-            is_active = cell_texts[1] != 'Inactive'
-            position_active = int(cell_texts[1]) if cell_texts[1].isdigit() else None
-            
-            # Nom
-            name = cell_texts[2]
-            
-            # Classement
-            ranking = cell_texts[3]
-            
-            # Matchs
-            matches = int(cell_texts[5]) if cell_texts[5].isdigit() else 0
-            
-            # Points
-            try:
-                points = float(cell_texts[6])
-            except (ValueError, IndexError):
-                points = 0.0
-            
-            # Licence (dans le lien "Voir fiche")
-            licence = None
-            action_cell = cells[7] if len(cells) > 7 else None
-            if action_cell:
-                link = action_cell.find('a')
-                if link:
-                    href = link.get('href', '')
-                    # Extraire la licence de l'URL (ex: fiche.php?licenceID=152174)
-                    licence_match = re.search(r'licenceID=(\d+)', href)
-                    if licence_match:
-                        licence = licence_match.group(1)
-                    else:
-                        # Essayer avec un pattern différent
-                        licence_match = re.search(r'(\d{6})', href)
-                        if licence_match:
-                            licence = licence_match.group(1)
-                
-                # Si pas trouvé dans le lien, chercher dans un formulaire
-                if not licence:
-                    form = action_cell.find('form')
-                    if form:
-                        input_field = form.find('input', {'name': 'licence'})
-                        if input_field:
-                            licence = input_field.get('value', '')
-            
-            if not licence:
-                # Dernier recours: chercher dans toute la ligne
-                licence_match = re.search(r'\b(\d{6})\b', str(row))
-                if licence_match:
-                    licence = licence_match.group(1)
-            
-            if name and licence:
-                player = RankingPlayer(
-                    position=position,
-                    position_active=position_active,
-                    licence=licence,
-                    name=name,
-                    ranking=ranking,
-                    club_code=club_code,
-                    matches=matches,
-                    points=points,
-                    gender=gender,
-                    is_active=is_active
-                )
-                players.append(player.to_dict())
-                
-        except Exception as e:
-            logger.debug(f"Erreur parsing ligne: {e}")
+        licence = None
+        if row['href']:
+            licence = _licence_from_href(row['href'])
+        if not licence:
+            licence = row['form_licence'] or None
+        if not licence and row['action_html']:
+            licence = _licence_from_html(row['action_html'])
+        if not licence and row['row_html']:
+            licence = _licence_from_html(row['row_html'])
+        
+        player = _parse_ranking_row(row['texts'], licence, club_code, gender)
+        if player:
+            players.append(player)
     
     return players
 
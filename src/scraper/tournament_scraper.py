@@ -6,12 +6,27 @@ depuis le site resultats.aftt.be
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import lxml.html
+from lxml import etree
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
+import functools
+import html
 import logging
+import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import (
+    SCRAPE_DELAY, SCRAPE_MAX_WORKERS,
+    SCRAPE_CACHE_DIR, SCRAPE_CACHE_TTL, SCRAPE_CACHE_ENABLED, TOURNAMENT_CACHE_TTL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +34,85 @@ logger = logging.getLogger(__name__)
 BASE_URL = "https://resultats.aftt.be"
 TOURNAMENTS_URL = f"{BASE_URL}/?menu=7"
 
-
-@dataclass
+# Session HTTP partagée entre les workers (keep-alive + pool de connexions)
+_session = requests.Session()
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+    # Pages très compressibles : annoncer br (si brotli est installé), gzip, deflate
+    'Accept-Encoding': ACCEPT_ENCODING,
+})
+# Un seul hôte (resultats.aftt.be) : un pool, assez de connexions pour les workers.
+# Les réponses 429 (rate limiting AFTT) et 5xx sont réessayées avec backoff,
+# en respectant l'en-tête Retry-After s'il est présent (attentes 1, 2, 4, 8, 16s).
+_session.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=max(16, SCRAPE_MAX_WORKERS * 3),
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+    ),
+))
+
+# Patterns compilés une fois au chargement du module (réutilisés à chaque ligne)
+_RE_T_ID = re.compile(r't_id=(\d+)')
+_RE_CUR_PAGE = re.compile(r'cur_page=(\d+)')
+_RE_DATE_RANGE = re.compile(r'(\d{2}/\d{2})-(\d{2}/\d{2})/(\d{4})')
+_RE_DATE_SIMPLE = re.compile(r'\d{2}/\d{2}/\d{4}')
+_RE_INSC = re.compile(r'(\d+)\s*/\s*(\d+)')
+_RE_SCORE = re.compile(r'\d[/\-]\d')
+_RE_NEXT_LINK = re.compile(r'\[Suivant\]', re.IGNORECASE)
+_RE_CLUB = re.compile(r'\(([^)]+)\)\s*$')
+_RE_RANKING = re.compile(r'\b(NC|E\d|D\d|C\d|B\d|A\d?)\b')
+_RE_CLUB_CODE = re.compile(r'^([A-Z]\d{3})')
+_RE_CACHE_KEY_UNSAFE = re.compile(r'[^A-Za-z0-9_-]+')
+
+# Liste des tournois : balisage très régulier (cinq cellules texte puis une cellule
+# d'actions avec les liens t_id=N), lu directement par regex sans construire de DOM.
+# Le bloc commence après l'en-tête Nom/Niveau et s'arrête à la fin du tableau.
+_RE_TOURNAMENTS_BLOCK = re.compile(
+    r'<th[^>]*>\s*Nom\s*</th>\s*<th[^>]*>\s*Niveau\s*</th>(.*?)</table>',
+    re.DOTALL | re.IGNORECASE,
+)
+_RE_TR_SPLIT = re.compile(r'<tr\b', re.IGNORECASE)
+_RE_TOURNAMENT_ROW = re.compile(
+    r'[^>]*>\s*' + r'<td[^>]*>([^<]*)</td>\s*' * 5 + r'<td[^>]*>.*?t_id=(\d+).*?</td>\s*</tr>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+# Expressions XPath compilées une fois (au lieu d'être recompilées à chaque page).
+# (//table[...])[1] : uniquement le premier tableau correspondant, dans l'ordre du document
+_XP_TOURNAMENTS_TABLE = etree.XPath(
+    '(//table[.//th[normalize-space()="Nom"] and .//th[normalize-space()="Niveau"]])[1]'
+)
+_XP_SERIES_TABLE = etree.XPath(
+    '(//table[.//th[normalize-space()="Série"]'
+    ' or (.//th[normalize-space()="Date"] and .//th[normalize-space()="Heure"])])[1]'
+)
+_XP_INSCRIPTIONS_TABLE = etree.XPath(
+    '(//table[.//th[normalize-space()="Index"] or .//th[normalize-space()="Nom"]])[1]'
+)
+_XP_ROWS_AFTER_HEADER = etree.XPath('(.//tr)[position() > 1]')
+_XP_RESULT_ROWS = etree.XPath('//table//tr[count(.//td) = 4]')
+_XP_PAGINATION_HREFS = etree.XPath('//a[contains(@href, "cur_page=")]/@href')
+_XP_HAS_LINK_TO = etree.XPath('boolean(//a[contains(@href, $needle)])')
+
+# Pagination des inscriptions/résultats: nombre max de pages et de pages
+# téléchargées en parallèle pour un même tournoi
+_MAX_PAGES = 50
+_PAGE_WORKERS = 4
+
+# Erreurs survenant pendant la lecture du corps de la réponse, hors de portée
+# du Retry urllib3 (qui ne couvre que la connexion et les en-têtes) :
+# la page entière est redemandée avec un backoff exponentiel.
+_BODY_ERRORS = (requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError)
+_FETCH_ATTEMPTS = 3
+
+
+@dataclass(slots=True)
 class Tournament:
     """Représente un tournoi de tennis de table."""
     t_id: int
@@ -32,10 +124,18 @@ class Tournament:
     series_count: int = 0
     
     def to_dict(self) -> dict:
-        return asdict(self)
-
-
-@dataclass
+        return {
+            't_id': self.t_id,
+            'name': self.name,
+            'level': self.level,
+            'date_start': self.date_start,
+            'date_end': self.date_end,
+            'reference': self.reference,
+            'series_count': self.series_count,
+        }
+
+
+@dataclass(slots=True)
 class TournamentSeries:
     """Représente une série d'un tournoi."""
     tournament_id: int
@@ -46,10 +146,17 @@ class TournamentSeries:
     inscriptions_max: int = 0
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            'tournament_id': self.tournament_id,
+            'series_name': self.series_name,
+            'date': self.date,
+            'time': self.time,
+            'inscriptions_count': self.inscriptions_count,
+            'inscriptions_max': self.inscriptions_max,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TournamentInscription:
     """Représente une inscription à un tournoi."""
     tournament_id: int
@@ -60,10 +167,17 @@ class TournamentInscription:
     player_ranking: Optional[str] = None
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            'tournament_id': self.tournament_id,
+            'series_name': self.series_name,
+            'player_licence': self.player_licence,
+            'player_name': self.player_name,
+            'player_club': self.player_club,
+            'player_ranking': self.player_ranking,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TournamentResult:
     """Représente un résultat de match dans un tournoi."""
     tournament_id: int
@@ -77,28 +191,158 @@ class TournamentResult:
     round: Optional[str] = None
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            'tournament_id': self.tournament_id,
+            'series_name': self.series_name,
+            'player1_licence': self.player1_licence,
+            'player1_name': self.player1_name,
+            'player2_licence': self.player2_licence,
+            'player2_name': self.player2_name,
+            'score': self.score,
+            'winner_licence': self.winner_licence,
+            'round': self.round,
+        }
+
+
+class _RateLimiter:
+    """
+    Limiteur de débit partagé entre threads: au plus une requête
+    toutes les `min_interval` secondes, quel que soit le nombre de workers.
+    """
+
+    def __init__(self, min_interval: float):
+        self._min_interval = min_interval
+        self._next_allowed = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Attend le prochain créneau libre."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self._min_interval
+        if wait > 0:
+            time.sleep(wait)
+
 
+# Limiteur global pour resultats.aftt.be (le serveur refuse les rafales de requêtes)
+_rate_limiter = _RateLimiter(SCRAPE_DELAY)
 
-def fetch_page(url: str) -> str:
+
+def _get_cache_path(url: str) -> Optional[str]:
     """
-    Récupère le contenu HTML d'une page.
+    Chemin du cache disque d'une page: cache/tournaments/{requête}.html
+    Retourne None si le cache est désactivé (AFTT_NO_CACHE=1).
     """
-    logger.debug(f"Récupération de la page : {url}")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
-    }
-    
+    if not SCRAPE_CACHE_ENABLED:
+        return None
+    query = url.split('?', 1)[1] if '?' in url else 'index'
+    return os.path.join(SCRAPE_CACHE_DIR, 'tournaments', f"{_RE_CACHE_KEY_UNSAFE.sub('_', query)}.html")
+
+
+def _cache_ttl(url: str) -> int:
+    """Durée de validité: courte pour la liste des tournois, longue pour les détails."""
+    return TOURNAMENT_CACHE_TTL if 't_id=' in url else SCRAPE_CACHE_TTL
+
+
+def _read_cached_page(cache_path: str, ttl: int) -> Optional[str]:
+    """Lit une page en cache si elle existe et n'a pas expiré."""
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        logger.error(f"Erreur lors de la récupération de la page : {e}")
-        raise
+        if time.time() - os.path.getmtime(cache_path) > ttl:
+            return None
+        with open(cache_path, 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    except OSError:
+        return None
+
+
+def _write_cached_page(cache_path: str, content: str) -> None:
+    """Écrit une page en cache de façon atomique (fichier temporaire + os.replace)."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Impossible d'écrire le cache {cache_path}: {e}")
+
+
+def fetch_page(url: str, use_cache: bool = True) -> str:
+    """
+    Récupère le contenu HTML d'une page.
+    Les appels sont espacés par le limiteur de débit global (AFTT_SCRAPE_DELAY).
+    Les pages sont mises en cache sur disque (AFTT_CACHE_TTL pour la liste,
+    AFTT_TOURNAMENT_CACHE_TTL pour les détails, désactivable via AFTT_NO_CACHE=1).
+    
+    Args:
+        url: URL de la page
+        use_cache: Si False, ignore la copie en cache (rescrape forcé) ;
+            la page récupérée remplace tout de même celle du cache
+    """
+    cache_path = _get_cache_path(url)
+    if cache_path and use_cache:
+        cached = _read_cached_page(cache_path, _cache_ttl(url))
+        if cached is not None:
+            logger.debug(f"Page lue depuis le cache : {url}")
+            return cached
+    
+    for attempt in range(_FETCH_ATTEMPTS):
+        _rate_limiter.acquire()
+        logger.debug(f"Récupération de la page : {url}")
+        
+        try:
+            response = _session.get(url, timeout=30)
+            response.raise_for_status()
+            # Toujours renvoyer un str décodé : le parseur lxml n'a alors pas à deviner
+            # l'encodage. La détection n'est faite que si le serveur n'en annonce aucun.
+            if response.encoding is None:
+                response.encoding = response.apparent_encoding
+            html_content = response.text
+            break
+        except _BODY_ERRORS as e:
+            if attempt == _FETCH_ATTEMPTS - 1:
+                logger.error(f"Erreur lors de la récupération de la page : {e}")
+                raise
+            delay = min(60, 2 ** attempt + random.random())
+            logger.warning(f"Réponse tronquée pour {url} ({e}), nouvel essai dans {delay:.1f}s")
+            time.sleep(delay)
+        except requests.RequestException as e:
+            # 429/5xx et erreurs réseau : déjà réessayés par l'adaptateur HTTP
+            logger.error(f"Erreur lors de la récupération de la page : {e}")
+            raise
+    
+    if cache_path:
+        _write_cached_page(cache_path, html_content)
+    return html_content
+
+
+def _parse_html(html_content: str) -> lxml.html.HtmlElement:
+    """
+    Parse une page HTML avec lxml (parseur C, tolérant au HTML mal formé d'AFTT).
+    Une page vide donne un document vide.
+    """
+    if not html_content or not html_content.strip():
+        html_content = '<html></html>'
+    return lxml.html.fromstring(html_content)
+
+
+def _cell_text(cell: lxml.html.HtmlElement) -> str:
+    """Texte d'une cellule de tableau, sans espaces en bordure."""
+    return cell.text_content().strip()
+
+
+def _is_bold(cell: lxml.html.HtmlElement) -> bool:
+    """Indique si une cellule contient du gras (<b> ou <strong>), marque du vainqueur."""
+    return cell.find('.//b') is not None or cell.find('.//strong') is not None
+
+
+def _has_next_page(doc: lxml.html.HtmlElement, page: int) -> bool:
+    """Indique si une page paginée a une suite (lien "[Suivant]" ou cur_page=N+1)."""
+    for link in doc.iter('a'):
+        if _RE_NEXT_LINK.search(link.text_content()):
+            return True
+    return _XP_HAS_LINK_TO(doc, needle=f'cur_page={page + 1}')
 
 
 def parse_date_range(date_str: str) -> tuple:
@@ -115,7 +359,7 @@ def parse_date_range(date_str: str) -> tuple:
     date_str = date_str.strip()
     
     # Pattern pour plage de dates: "DD/MM-DD/MM/YYYY"
-    range_match = re.match(r'(\d{2}/\d{2})-(\d{2}/\d{2})/(\d{4})', date_str)
+    range_match = _RE_DATE_RANGE.match(date_str)
     if range_match:
         day_month_start = range_match.group(1)
         day_month_end = range_match.group(2)
@@ -123,286 +367,328 @@ def parse_date_range(date_str: str) -> tuple:
         return (f"{day_month_start}/{year}", f"{day_month_end}/{year}")
     
     # Date simple: "DD/MM/YYYY"
-    simple_match = re.match(r'\d{2}/\d{2}/\d{4}', date_str)
+    simple_match = _RE_DATE_SIMPLE.match(date_str)
     if simple_match:
         return (date_str, date_str)
     
     return (date_str, date_str)
 
 
+@functools.lru_cache(maxsize=65536)
+def parse_player_info(text: str) -> tuple:
+    """
+    Parse la cellule d'un joueur dans les résultats.
+    
+    Format: "NOM PRENOM Classement (Club)"
+    Retourne (nom, classement, club, code club) ; le code club (ex: H448 de
+    "H448 Cleo Erquelinnes") sert d'identifiant de licence.
+    
+    Mémoïsé : un même joueur apparaît dans de nombreux matchs d'un tournoi.
+    La taille du cache est bornée (thread-safe, partagé entre les workers).
+    """
+    # Extraire le club entre parenthèses (ancré en fin de texte)
+    club_match = _RE_CLUB.search(text)
+    if club_match:
+        club = club_match.group(1)
+        # Retirer le club du texte
+        name_ranking = text[:club_match.start()].strip()
+    else:
+        club = None
+        name_ranking = text.strip()
+    
+    # Extraire le classement (NC, E0, E2, D6, C4, B2, etc.)
+    ranking_match = _RE_RANKING.search(name_ranking)
+    
+    # Le nom est tout ce qui reste (tous les jetons de classement retirés)
+    if ranking_match:
+        ranking = ranking_match.group(1)
+        name = _RE_RANKING.sub('', name_ranking).strip()
+    else:
+        ranking = None
+        name = name_ranking
+    
+    # Extraire la licence du club (ex: H448 de "H448 Cleo Erquelinnes")
+    licence = None
+    if club:
+        licence_match = _RE_CLUB_CODE.match(club)
+        if licence_match:
+            licence = licence_match.group(1)
+    
+    return name, ranking, club, licence
+
+
 def extract_t_id_from_url(url: str) -> Optional[int]:
     """Extrait le t_id d'une URL."""
-    match = re.search(r't_id=(\d+)', url)
+    match = _RE_T_ID.search(url)
     if match:
         return int(match.group(1))
     return None
 
 
-def get_tournaments_page(page: int = 1) -> List[Tournament]:
+def get_tournaments_page(page: int = 1, use_cache: bool = True) -> List[Tournament]:
     """
     Récupère la liste des tournois d'une page donnée.
     """
+    tournaments, _ = _fetch_tournaments_page(page, use_cache)
+    return tournaments
+
+
+def _fetch_tournaments_page(page: int, use_cache: bool = True) -> tuple:
+    """
+    Récupère une page de la liste des tournois.
+    
+    Returns:
+        (tournois de la page, numéro de la dernière page vue dans la pagination)
+    """
     url = f"{TOURNAMENTS_URL}&cur_page={page}" if page > 1 else TOURNAMENTS_URL
-    html_content = fetch_page(url)
-    soup = BeautifulSoup(html_content, 'html.parser')
+    html_content = fetch_page(url, use_cache)
+    
+    tournaments = _parse_tournaments_rows_fast(html_content)
+    if tournaments is not None:
+        max_page = max((int(p) for p in _RE_CUR_PAGE.findall(html_content)), default=1)
+        return tournaments, max_page
+    
+    logger.debug(f"Format de la liste des tournois inattendu (page {page}), parsing lxml")
+    doc = _parse_html(html_content)
+    return _parse_tournaments_table(doc), _count_total_pages(doc)
+
+
+def _parse_tournaments_rows_fast(html_content: str) -> Optional[List[Tournament]]:
+    """
+    Extrait les tournois de la liste par regex, sans DOM.
+    
+    Returns:
+        La liste des tournois, ou None si le balisage ne correspond pas au format
+        attendu (tableau introuvable ou ligne avec un t_id non reconnue) :
+        l'appelant se rabat alors sur le parsing lxml.
+    """
+    block = _RE_TOURNAMENTS_BLOCK.search(html_content)
+    if not block:
+        return None
     
     tournaments = []
+    for row in _RE_TR_SPLIT.split(block.group(1))[1:]:
+        # Lignes sans lien de tournoi (pagination) : ignorées comme dans le parsing lxml
+        if 't_id=' not in row:
+            continue
+        match = _RE_TOURNAMENT_ROW.match(row)
+        if not match:
+            return None
+        *texts, t_id = match.groups()
+        name, level, date_str, reference, series_count_str = (html.unescape(t).strip() for t in texts)
+        if name:
+            tournaments.append(_build_tournament(
+                int(t_id), name, level, date_str, reference, series_count_str
+            ))
+    return tournaments
+
+
+def _count_total_pages(doc: lxml.html.HtmlElement) -> int:
+    """Plus grand numéro cur_page=N des liens de pagination (1 si aucun)."""
+    max_page = 1
+    for href in _XP_PAGINATION_HREFS(doc):
+        match = _RE_CUR_PAGE.search(href)
+        if match:
+            max_page = max(max_page, int(match.group(1)))
+    return max_page
+
+
+def _parse_tournaments_table(doc: lxml.html.HtmlElement) -> List[Tournament]:
+    """Extrait les tournois du tableau de la liste."""
+    tournaments = []
     
     # Trouver le tableau des tournois
     # Le tableau a des colonnes: Nom, Niveau, Date, Réf., Nombre Séries, Actions
-    tables = soup.find_all('table')
+    tables = _XP_TOURNAMENTS_TABLE(doc)
+    if not tables:
+        return tournaments
+    
+    rows = _XP_ROWS_AFTER_HEADER(tables[0])  # Skip header row
     
-    for table in tables:
-        # Chercher le header qui contient "Nom" et "Niveau"
-        headers = table.find_all('th')
-        header_texts = [h.get_text(strip=True) for h in headers]
+    for row in rows:
+        cells = row.findall('td')
         
-        if 'Nom' in header_texts and 'Niveau' in header_texts:
-            # C'est le bon tableau
-            rows = table.find_all('tr')[1:]  # Skip header row
-            
-            for row in rows:
-                cells = row.find_all('td')
-                
-                # Skip pagination row
-                if len(cells) < 5:
-                    continue
-                
-                # Extraire les données
-                name = cells[0].get_text(strip=True) if len(cells) > 0 else ""
-                level = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                date_str = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                reference = cells[3].get_text(strip=True) if len(cells) > 3 else ""
-                series_count_str = cells[4].get_text(strip=True) if len(cells) > 4 else "0"
-                
-                # Extraire le t_id depuis les liens d'actions
-                t_id = None
-                if len(cells) > 5:
-                    links = cells[5].find_all('a')
-                    for link in links:
-                        href = link.get('href', '')
-                        t_id = extract_t_id_from_url(href)
-                        if t_id:
-                            break
-                
-                if not t_id or not name:
-                    continue
-                
-                # Parser la date
-                date_start, date_end = parse_date_range(date_str)
-                
-                # Parser le nombre de séries
-                try:
-                    series_count = int(series_count_str)
-                except ValueError:
-                    series_count = 0
-                
-                tournament = Tournament(
-                    t_id=t_id,
-                    name=name,
-                    level=level if level else None,
-                    date_start=date_start,
-                    date_end=date_end,
-                    reference=reference if reference else None,
-                    series_count=series_count
-                )
-                tournaments.append(tournament)
-            
-            break  # On a trouvé le bon tableau
+        # Skip pagination row
+        if len(cells) < 5:
+            continue
+        
+        # Extraire les données (cellule d'actions exclue, lue pour ses liens)
+        name, level, date_str, reference, series_count_str = map(_cell_text, cells[:5])
+        
+        # Extraire le t_id depuis les liens d'actions
+        t_id = None
+        if len(cells) > 5:
+            for link in cells[5].iterfind('.//a[@href]'):
+                t_id = extract_t_id_from_url(link.get('href'))
+                if t_id:
+                    break
+        
+        if not t_id or not name:
+            continue
+        
+        tournaments.append(_build_tournament(t_id, name, level, date_str, reference, series_count_str))
     
     return tournaments
 
 
+def _build_tournament(
+    t_id: int, name: str, level: str, date_str: str, reference: str, series_count_str: str
+) -> Tournament:
+    """Construit un Tournament à partir des textes des cellules d'une ligne de la liste."""
+    # Parser la date
+    date_start, date_end = parse_date_range(date_str)
+    
+    # Parser le nombre de séries
+    try:
+        series_count = int(series_count_str)
+    except ValueError:
+        series_count = 0
+    
+    return Tournament(
+        t_id=t_id,
+        name=name,
+        level=level if level else None,
+        date_start=date_start,
+        date_end=date_end,
+        reference=reference if reference else None,
+        series_count=series_count
+    )
+
+
 def get_total_pages() -> int:
     """
     Récupère le nombre total de pages de tournois.
     """
-    html_content = fetch_page(TOURNAMENTS_URL)
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Chercher les liens de pagination
-    pagination_links = soup.find_all('a', href=re.compile(r'cur_page=\d+'))
-    
-    max_page = 1
-    for link in pagination_links:
-        href = link.get('href', '')
-        match = re.search(r'cur_page=(\d+)', href)
-        if match:
-            page_num = int(match.group(1))
-            max_page = max(max_page, page_num)
-    
+    _, max_page = _fetch_tournaments_page(1)
     return max_page
 
 
-def get_all_tournaments() -> List[Tournament]:
+def get_all_tournaments(use_cache: bool = True) -> List[Tournament]:
     """
     Récupère tous les tournois de toutes les pages.
+    La première page donne à la fois ses tournois et le nombre de pages.
+    use_cache=False ignore le cache disque (scraping manuel forcé).
     """
-    total_pages = get_total_pages()
+    all_tournaments, total_pages = _fetch_tournaments_page(1, use_cache)
     logger.info(f"Récupération de {total_pages} pages de tournois...")
     
-    all_tournaments = []
-    
-    for page in range(1, total_pages + 1):
-        logger.info(f"Page {page}/{total_pages}...")
-        tournaments = get_tournaments_page(page)
-        all_tournaments.extend(tournaments)
-        
-        # Pause pour ne pas surcharger le serveur
-        if page < total_pages:
-            time.sleep(0.5)
+    # Pages suivantes en parallèle : le limiteur de fetch_page espace les
+    # requêtes, map() conserve l'ordre des pages
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(SCRAPE_MAX_WORKERS, total_pages - 1)) as executor:
+            pages = range(2, total_pages + 1)
+            for tournaments in executor.map(lambda p: get_tournaments_page(p, use_cache), pages):
+                all_tournaments.extend(tournaments)
     
     logger.info(f"Total: {len(all_tournaments)} tournois récupérés")
     return all_tournaments
 
 
-def get_tournament_series(t_id: int) -> List[TournamentSeries]:
+def get_tournament_series(t_id: int, use_cache: bool = True) -> List[Dict[str, Any]]:
     """
     Récupère les séries d'un tournoi.
+    Renvoie des dicts aux clés de TournamentSeries.to_dict().
     """
     url = f"{BASE_URL}/?menu=7&viewseries=1&t_id={t_id}"
-    html_content = fetch_page(url)
-    soup = BeautifulSoup(html_content, 'html.parser')
+    html_content = fetch_page(url, use_cache)
+    doc = _parse_html(html_content)
     
     series_list = []
     
-    # Trouver le tableau des séries
+    # Trouver le tableau des séries (premier tableau qui a les bons en-têtes)
     # Colonnes: Date, Heure, Série, Nombre Inscriptions, Actions
-    tables = soup.find_all('table')
-    
-    for table in tables:
-        headers = table.find_all('th')
-        header_texts = [h.get_text(strip=True) for h in headers]
+    tables = _XP_SERIES_TABLE(doc)
+    if tables:
+        rows = _XP_ROWS_AFTER_HEADER(tables[0])  # Skip header row
         
-        if 'Série' in header_texts or 'Date' in header_texts and 'Heure' in header_texts:
-            rows = table.find_all('tr')[1:]  # Skip header row
+        for row in rows:
+            cells = row.findall('.//td')
             
-            for row in rows:
-                cells = row.find_all('td')
-                
-                if len(cells) < 4:
-                    continue
-                
-                date = cells[0].get_text(strip=True) if len(cells) > 0 else ""
-                time_str = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                series_name = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                inscriptions_str = cells[3].get_text(strip=True) if len(cells) > 3 else ""
-                
-                if not series_name:
-                    continue
-                
-                # Parser "36 / 36" -> count=36, max=36
-                inscriptions_count = 0
-                inscriptions_max = 0
-                insc_match = re.match(r'(\d+)\s*/\s*(\d+)', inscriptions_str)
-                if insc_match:
-                    inscriptions_count = int(insc_match.group(1))
-                    inscriptions_max = int(insc_match.group(2))
-                elif inscriptions_str.isdigit():
-                    inscriptions_count = int(inscriptions_str)
-                
-                series = TournamentSeries(
-                    tournament_id=t_id,
-                    series_name=series_name,
-                    date=date if date else None,
-                    time=time_str if time_str else None,
-                    inscriptions_count=inscriptions_count,
-                    inscriptions_max=inscriptions_max
-                )
-                series_list.append(series)
+            if len(cells) < 4:
+                continue
             
-            break
+            # Textes des cellules utiles lus en une passe
+            date, time_str, series_name, inscriptions_str = map(_cell_text, cells[:4])
+            
+            if not series_name:
+                continue
+            
+            # Parser "36 / 36" -> count=36, max=36
+            inscriptions_count = 0
+            inscriptions_max = 0
+            insc_match = _RE_INSC.match(inscriptions_str)
+            if insc_match:
+                inscriptions_count = int(insc_match.group(1))
+                inscriptions_max = int(insc_match.group(2))
+            elif inscriptions_str.isdigit():
+                inscriptions_count = int(inscriptions_str)
+            
+            # Dict construit directement (mêmes clés que TournamentSeries.to_dict())
+            series_list.append({
+                'tournament_id': t_id,
+                'series_name': series_name,
+                'date': date if date else None,
+                'time': time_str if time_str else None,
+                'inscriptions_count': inscriptions_count,
+                'inscriptions_max': inscriptions_max,
+            })
     
     return series_list
 
 
-def get_tournament_inscriptions(t_id: int) -> List[TournamentInscription]:
+def get_tournament_inscriptions(t_id: int, use_cache: bool = True) -> List[Dict[str, Any]]:
     """
     Récupère les inscriptions d'un tournoi depuis la page viewplayers.
     
     Format de la page: https://resultats.aftt.be/?menu=7&viewplayers=1&t_id=XXX
     Colonnes: Série | Index | Nom | Club | Classement | Actions
     Les inscriptions sont paginées (cur_page=1, 2, 3...).
+    Renvoie des dicts aux clés de TournamentInscription.to_dict().
     """
-    all_inscriptions = []
-    page = 1
+    url = f"{BASE_URL}/?menu=7&viewplayers=1&t_id={t_id}"
+    all_inscriptions, pages = _fetch_all_pages(url, _parse_inscriptions_page, t_id, use_cache)
+    logger.info(f"Tournoi {t_id}: {len(all_inscriptions)} inscriptions récupérées sur {pages} page(s)")
+    return all_inscriptions
+
+
+def _parse_inscriptions_page(doc: lxml.html.HtmlElement, t_id: int) -> List[Dict[str, Any]]:
+    """Extrait les inscriptions d'une page viewplayers."""
+    inscriptions = []
     
-    while True:
-        if page == 1:
-            url = f"{BASE_URL}/?menu=7&viewplayers=1&t_id={t_id}"
-        else:
-            url = f"{BASE_URL}/?menu=7&viewplayers=1&t_id={t_id}&cur_page={page}"
-        
-        html_content = fetch_page(url)
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        inscriptions_on_page = []
+    # Trouver le tableau des inscriptions (premier tableau Index/Nom)
+    # Colonnes: Série, Index, Nom, Club, Classement, Actions
+    tables = _XP_INSCRIPTIONS_TABLE(doc)
+    if tables:
+        rows = _XP_ROWS_AFTER_HEADER(tables[0])  # Skip header row
         
-        # Trouver le tableau des inscriptions
-        # Colonnes: Série, Index, Nom, Club, Classement, Actions
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            headers = table.find_all('th')
-            header_texts = [h.get_text(strip=True) for h in headers]
+        for row in rows:
+            cells = row.findall('.//td')
             
-            # Vérifier si c'est le bon tableau
-            if 'Index' in header_texts or 'Nom' in header_texts:
-                rows = table.find_all('tr')[1:]  # Skip header row
-                
-                for row in rows:
-                    cells = row.find_all('td')
-                    
-                    # Format attendu: 6 colonnes (Série, Index, Nom, Club, Classement, Actions)
-                    if len(cells) < 5:
-                        continue
-                    
-                    series_name = cells[0].get_text(strip=True) if len(cells) > 0 else ""
-                    licence = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-                    name = cells[2].get_text(strip=True) if len(cells) > 2 else ""
-                    club = cells[3].get_text(strip=True) if len(cells) > 3 else ""
-                    ranking = cells[4].get_text(strip=True) if len(cells) > 4 else ""
-                    
-                    # Vérifier que ce n'est pas une ligne de header ou pagination
-                    if not licence or not name:
-                        continue
-                    if series_name.lower() in ['série', 'serie', 'series']:
-                        continue
-                    
-                    inscription = TournamentInscription(
-                        tournament_id=t_id,
-                        series_name=series_name,
-                        player_licence=licence,
-                        player_name=name,
-                        player_club=club if club else None,
-                        player_ranking=ranking if ranking else None
-                    )
-                    inscriptions_on_page.append(inscription)
-                
-                break
-        
-        all_inscriptions.extend(inscriptions_on_page)
-        
-        # Vérifier s'il y a une page suivante
-        next_link = soup.find('a', string=re.compile(r'\[Suivant\]', re.IGNORECASE))
-        if not next_link:
-            next_page_link = soup.find('a', href=re.compile(f'cur_page={page + 1}'))
-            if not next_page_link:
-                break
-        
-        page += 1
-        time.sleep(0.2)  # Rate limiting
-        
-        # Sécurité: max 50 pages
-        if page > 50:
-            logger.warning(f"Arrêt à la page 50 pour les inscriptions du tournoi {t_id}")
-            break
+            # Format attendu: 6 colonnes (Série, Index, Nom, Club, Classement, Actions)
+            if len(cells) < 5:
+                continue
+            
+            series_name, licence, name, club, ranking = map(_cell_text, cells[:5])
+            
+            # Vérifier que ce n'est pas une ligne de header ou pagination
+            if not licence or not name:
+                continue
+            if series_name.lower() in ['série', 'serie', 'series']:
+                continue
+            
+            inscriptions.append({
+                'tournament_id': t_id,
+                'series_name': series_name,
+                'player_licence': licence,
+                'player_name': name,
+                'player_club': club if club else None,
+                'player_ranking': ranking if ranking else None,
+            })
     
-    logger.info(f"Tournoi {t_id}: {len(all_inscriptions)} inscriptions récupérées sur {page} page(s)")
-    return all_inscriptions
+    return inscriptions
 
 
-def get_tournament_results(t_id: int) -> List[TournamentResult]:
+def get_tournament_results(t_id: int, use_cache: bool = True) -> List[Dict[str, Any]]:
     """
     Récupère les résultats d'un tournoi depuis la page viewresults.
     
@@ -410,151 +696,139 @@ def get_tournament_results(t_id: int) -> List[TournamentResult]:
     Le tableau contient: Série | Joueur | Nom adversaire | Résultats
     Le vainqueur est en gras (balise <b> ou <strong>).
     Les résultats sont paginés (cur_page=1, 2, 3...).
+    Renvoie des dicts aux clés de TournamentResult.to_dict().
     """
-    all_results = []
-    page = 1
+    url = f"{BASE_URL}/?menu=7&viewresults=1&t_id={t_id}"
+    all_results, pages = _fetch_all_pages(url, _parse_results_page, t_id, use_cache)
+    logger.info(f"Tournoi {t_id}: {len(all_results)} résultats récupérés sur {pages} page(s)")
+    return all_results
+
+
+def _parse_results_page(doc: lxml.html.HtmlElement, t_id: int) -> List[Dict[str, Any]]:
+    """Extrait les résultats d'une page viewresults."""
+    results = []
     
-    while True:
-        if page == 1:
-            url = f"{BASE_URL}/?menu=7&viewresults=1&t_id={t_id}"
-        else:
-            url = f"{BASE_URL}/?menu=7&viewresults=1&t_id={t_id}&cur_page={page}"
+    # Lignes de résultats, tous tableaux confondus
+    # Format attendu: 4 colonnes (Série | Joueur | Nom adversaire | Résultats)
+    for row in _XP_RESULT_ROWS(doc):
+        cells = row.findall('.//td')
         
-        html_content = fetch_page(url)
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Vérifier d'abord le format du score (X/Y ou X-Y) : écarte les
+        # lignes d'en-tête et de pagination sans lire les autres cellules
+        score = _cell_text(cells[3])
+        if not _RE_SCORE.search(score):
+            continue
         
-        results_on_page = []
+        # Vérifier si c'est un header ou une ligne de données
+        series_name = _cell_text(cells[0])
+        if not series_name or series_name.lower() in ['série', 'serie', 'series']:
+            continue
         
-        # Chercher le tableau de résultats
-        # Format: Série | Joueur | Nom adversaire | Résultats
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            
-            for row in rows:
-                cells = row.find_all('td')
-                
-                # Format attendu: 4 colonnes (Série, Joueur1, Joueur2, Score)
-                if len(cells) == 4:
-                    series_name = cells[0].get_text(strip=True)
-                    player1_cell = cells[1]
-                    player2_cell = cells[2]
-                    score_cell = cells[3]
-                    
-                    # Extraire les noms de joueurs
-                    player1_text = player1_cell.get_text(strip=True)
-                    player2_text = player2_cell.get_text(strip=True)
-                    score = score_cell.get_text(strip=True)
-                    
-                    # Vérifier si c'est un header ou une ligne de données
-                    if not series_name or series_name.lower() in ['série', 'serie', 'series']:
-                        continue
-                    
-                    # Vérifier le format du score (X/Y ou X-Y)
-                    if not re.search(r'\d[/\-]\d', score):
-                        continue
-                    
-                    # Déterminer le vainqueur (en gras)
-                    winner_licence = None
-                    player1_is_winner = player1_cell.find('b') is not None or player1_cell.find('strong') is not None
-                    player2_is_winner = player2_cell.find('b') is not None or player2_cell.find('strong') is not None
-                    
-                    # Parser les informations du joueur
-                    # Format: "NOM PRENOM Classement (Club)"
-                    def parse_player_info(text):
-                        # Extraire le club entre parenthèses
-                        club_match = re.search(r'\(([^)]+)\)\s*$', text)
-                        club = club_match.group(1) if club_match else None
-                        
-                        # Retirer le club du texte
-                        name_ranking = re.sub(r'\([^)]+\)\s*$', '', text).strip()
-                        
-                        # Extraire le classement (NC, E0, E2, D6, C4, B2, etc.)
-                        ranking_match = re.search(r'\b(NC|E\d|D\d|C\d|B\d|A\d?)\b', name_ranking)
-                        ranking = ranking_match.group(1) if ranking_match else None
-                        
-                        # Le nom est tout ce qui reste
-                        if ranking:
-                            name = re.sub(r'\b(NC|E\d|D\d|C\d|B\d|A\d?)\b', '', name_ranking).strip()
-                        else:
-                            name = name_ranking
-                        
-                        # Extraire la licence du club (ex: H448 de "H448 Cleo Erquelinnes")
-                        licence = None
-                        if club:
-                            licence_match = re.match(r'^([A-Z]\d{3})', club)
-                            if licence_match:
-                                licence = licence_match.group(1)
-                        
-                        return name, ranking, club, licence
-                    
-                    p1_name, p1_ranking, p1_club, p1_licence = parse_player_info(player1_text)
-                    p2_name, p2_ranking, p2_club, p2_licence = parse_player_info(player2_text)
-                    
-                    # Déterminer le vainqueur
-                    if player1_is_winner and p1_licence:
-                        winner_licence = p1_licence
-                    elif player2_is_winner and p2_licence:
-                        winner_licence = p2_licence
-                    
-                    if p1_name and p2_name:
-                        result = TournamentResult(
-                            tournament_id=t_id,
-                            series_name=series_name,
-                            player1_name=p1_name,
-                            player1_licence=p1_licence,
-                            player2_name=p2_name,
-                            player2_licence=p2_licence,
-                            score=score,
-                            winner_licence=winner_licence
-                        )
-                        results_on_page.append(result)
+        # Extraire les noms de joueurs
+        player1_cell = cells[1]
+        player2_cell = cells[2]
+        player1_text = _cell_text(player1_cell)
+        player2_text = _cell_text(player2_cell)
         
-        all_results.extend(results_on_page)
+        # Déterminer le vainqueur (en gras)
+        winner_licence = None
+        player1_is_winner = _is_bold(player1_cell)
+        player2_is_winner = _is_bold(player2_cell)
         
-        # Vérifier s'il y a une page suivante
-        # Chercher le lien "[Suivant]"
-        next_link = soup.find('a', string=re.compile(r'\[Suivant\]', re.IGNORECASE))
-        if not next_link:
-            # Ou chercher un lien vers la page suivante
-            next_page_link = soup.find('a', href=re.compile(f'cur_page={page + 1}'))
-            if not next_page_link:
-                break
+        # Parser les informations des joueurs ("NOM PRENOM Classement (Club)")
+        p1_name, p1_ranking, p1_club, p1_licence = parse_player_info(player1_text)
+        p2_name, p2_ranking, p2_club, p2_licence = parse_player_info(player2_text)
         
-        page += 1
-        time.sleep(0.2)  # Rate limiting
+        # Déterminer le vainqueur
+        if player1_is_winner and p1_licence:
+            winner_licence = p1_licence
+        elif player2_is_winner and p2_licence:
+            winner_licence = p2_licence
         
-        # Sécurité: max 50 pages
-        if page > 50:
-            logger.warning(f"Arrêt à la page 50 pour le tournoi {t_id}")
+        if p1_name and p2_name:
+            results.append({
+                'tournament_id': t_id,
+                'series_name': series_name,
+                'player1_licence': p1_licence,
+                'player1_name': p1_name,
+                'player2_licence': p2_licence,
+                'player2_name': p2_name,
+                'score': score,
+                'winner_licence': winner_licence,
+                'round': None,
+            })
+    
+    return results
+
+
+def _fetch_all_pages(url: str, parse_page, t_id: int, use_cache: bool = True) -> tuple:
+    """
+    Récupère et parse toutes les pages d'une liste paginée (cur_page=1, 2, 3...).
+    
+    Le nombre de pages est lu dans la pagination de la page déjà récupérée :
+    les pages suivantes connues sont alors téléchargées en parallèle plutôt
+    qu'en suivant "[Suivant]" une à une. Si la dernière page annonce encore
+    une suite (pagination tronquée), on recommence à partir d'elle.
+    
+    Returns:
+        (éléments de toutes les pages dans l'ordre, nombre de pages récupérées)
+    """
+    doc = _parse_html(fetch_page(url, use_cache))
+    items = parse_page(doc, t_id)
+    page = 1
+    
+    while _has_next_page(doc, page):
+        # Sécurité: max _MAX_PAGES pages
+        if page >= _MAX_PAGES:
+            logger.warning(f"Arrêt à la page {_MAX_PAGES} pour le tournoi {t_id} ({url})")
             break
+        
+        last_page = min(max(_count_total_pages(doc), page + 1), _MAX_PAGES)
+        pages = range(page + 1, last_page + 1)
+        with ThreadPoolExecutor(max_workers=min(_PAGE_WORKERS, len(pages))) as executor:
+            docs = list(executor.map(lambda p: _parse_html(fetch_page(f"{url}&cur_page={p}", use_cache)), pages))
+        
+        for page_doc in docs:
+            items.extend(parse_page(page_doc, t_id))
+        # La suite éventuelle se lit sur la dernière page récupérée
+        doc = docs[-1]
+        page = last_page
     
-    logger.info(f"Tournoi {t_id}: {len(all_results)} résultats récupérés sur {page} page(s)")
-    return all_results
+    return items, page
 
 
-def get_tournament_details(t_id: int) -> Dict[str, Any]:
+def get_tournament_details(t_id: int, use_cache: bool = True) -> Dict[str, Any]:
     """
     Récupère tous les détails d'un tournoi (séries, inscriptions, résultats).
+    use_cache=False ignore le cache disque (rescrape forcé) et le rafraîchit.
     """
     logger.info(f"Récupération des détails du tournoi {t_id}...")
     
-    series = get_tournament_series(t_id)
-    time.sleep(0.3)
-    
-    inscriptions = get_tournament_inscriptions(t_id)
-    time.sleep(0.3)
-    
-    results = get_tournament_results(t_id)
+    # Les trois pages sont indépendantes : les récupérer en parallèle
+    # (le débit reste borné par le limiteur de fetch_page)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        series_future = executor.submit(get_tournament_series, t_id, use_cache)
+        inscriptions_future = executor.submit(get_tournament_inscriptions, t_id, use_cache)
+        results_future = executor.submit(get_tournament_results, t_id, use_cache)
+        series = series_future.result()
+        inscriptions = inscriptions_future.result()
+        results = results_future.result()
     
     return {
-        'series': [s.to_dict() for s in series],
-        'inscriptions': [i.to_dict() for i in inscriptions],
-        'results': [r.to_dict() for r in results]
+        'series': series,
+        'inscriptions': inscriptions,
+        'results': results
     }
 
 
+def _get_tournament_details_safe(t_id: int) -> tuple:
+    """Variante de get_tournament_details pour les workers: renvoie (details, erreur)."""
+    try:
+        return get_tournament_details(t_id), None
+    except Exception as e:
+        return None, e
+
+
 def scrape_all_tournaments_with_details(log_callback=None) -> Dict[str, Any]:
     """
     Scrape tous les tournois avec leurs détails.
@@ -578,21 +852,25 @@ def scrape_all_tournaments_with_details(log_callback=None) -> Dict[str, Any]:
     all_inscriptions = []
     all_results = []
     
-    for i, tournament in enumerate(tournaments, 1):
-        log(f"[TOURNAMENTS] {i}/{len(tournaments)} - {tournament.name}...")
+    # Les tournois sont traités en parallèle, les résultats sont consommés dans l'ordre
+    with ThreadPoolExecutor(max_workers=SCRAPE_MAX_WORKERS) as executor:
+        outcomes = executor.map(_get_tournament_details_safe, [t.t_id for t in tournaments])
         
-        try:
-            details = get_tournament_details(tournament.t_id)
+        for i, (tournament, (details, error)) in enumerate(zip(tournaments, outcomes), 1):
+            log(f"[TOURNAMENTS] {i}/{len(tournaments)} - {tournament.name}...")
+            
+            if error:
+                log(f"[TOURNAMENTS]   -> Erreur: {error}")
+                continue
+            
             all_series.extend(details['series'])
             all_inscriptions.extend(details['inscriptions'])
             all_results.extend(details['results'])
             
             log(f"[TOURNAMENTS]   -> {len(details['series'])} séries, {len(details['inscriptions'])} inscriptions, {len(details['results'])} résultats")
-        except Exception as e:
-            log(f"[TOURNAMENTS]   -> Erreur: {e}")
-        
-        # Pause entre chaque tournoi
-        time.sleep(0.5)
+    
+    # Libérer les cellules joueurs mémoïsées une fois le scraping complet terminé
+    parse_player_info.cache_clear()
     
     log(f"[TOURNAMENTS] Terminé: {len(tournaments)} tournois, {len(all_series)} séries, {len(all_inscriptions)} inscriptions, {len(all_results)} résultats")
     
@@ -2,99 +2,116 @@
 Tests d'intégration pour l'API FastAPI.
 Utilise httpx TestClient avec une DB de test.
 """
+import asyncio
 import pytest
 import sqlite3
 import os
-import sys
-from unittest.mock import patch, MagicMock
+import uuid
+from unittest.mock import patch
+
+# L'app est importée une fois pour tout le module : l'import ne déclenche ni
+# initialisation de la DB ni scraping (réservés au lifespan, lancé par client)
+from src.api.app import app
+
+# Tests async exécutés par le plugin pytest d'anyio (backend fixé par anyio_backend)
+pytestmark = pytest.mark.anyio
+
+# DB de test en mémoire partagée (cache=shared) : toutes les connexions ouvertes
+# par l'app sur cette URI voient la même base, sans aucun fichier sur disque
+TEST_DB_URI = f"file:aftt_test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+# Tables vidées entre deux tests (enfants avant parents). Liste explicite :
+# une nouvelle table doit y être ajoutée pour ne pas garder d'état entre tests.
+_TRUNCATE_SQL = """
+DELETE FROM matches;
+DELETE FROM player_stats;
+DELETE FROM tournament_results;
+DELETE FROM tournament_inscriptions;
+DELETE FROM tournament_series;
+DELETE FROM tournaments;
+DELETE FROM interclubs_rankings;
+DELETE FROM interclubs_matches;
+DELETE FROM interclubs_divisions;
+DELETE FROM players;
+DELETE FROM clubs;
+DELETE FROM scrape_tasks;
+"""
 
-# Préparer l'environnement AVANT d'importer l'app
-# Utiliser une DB de test temporaire
-TEST_DB_PATH = os.path.join(os.path.dirname(__file__), 'test_api.db')
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Backend asyncio, partagé par toute la session (une seule boucle)."""
+    return "asyncio"
 
-@pytest.fixture(autouse=True)
+
+@pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
-    """Crée une DB de test propre avant chaque test."""
-    # Supprimer la DB de test si elle existe
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
+    """Crée la DB de test (en mémoire) une seule fois pour toute la session."""
+    os.environ['AFTT_DB_PATH'] = TEST_DB_URI
 
-    # Configurer la variable d'environnement
-    os.environ['AFTT_DB_PATH'] = TEST_DB_PATH
+    # Une base en mémoire disparaît à la fermeture de sa dernière connexion :
+    # celle-ci la garde en vie pendant toute la session
+    keeper = sqlite3.connect(TEST_DB_URI, uri=True)
 
-    # Patcher le scraping d'init pour ne pas appeler le réseau
-    with patch('src.scraper.clubs_scraper.get_all_clubs', return_value=[]):
-        # Importer l'app (la première fois, cela initialise la DB)
-        # Re-import pour reset
-        if 'src.api.app' in sys.modules:
-            # Réinitialiser la DB
-            from src.database.connection import init_database
-            init_database(TEST_DB_PATH)
-        else:
-            import src.api.app  # noqa
-
-        from src.api.app import app
-        from src.database.connection import init_database
-        init_database(TEST_DB_PATH)
-
-        yield app
-
-    # Cleanup
-    if os.path.exists(TEST_DB_PATH):
-        os.remove(TEST_DB_PATH)
-    # Supprimer aussi les fichiers WAL/SHM
-    for ext in ['-wal', '-shm']:
-        path = TEST_DB_PATH + ext
-        if os.path.exists(path):
-            os.remove(path)
+    yield keeper
 
+    keeper.close()
 
-@pytest.fixture
-def client(setup_test_db):
-    """Client HTTP de test."""
+
+@pytest.fixture(autouse=True)
+def _wipe(setup_test_db, client):
+    """Vide les tables après chaque test, en une seule transaction."""
+    yield
+    setup_test_db.executescript(f"BEGIN;{_TRUNCATE_SQL}COMMIT;")
+
+
+@pytest.fixture(scope="session")
+async def client(setup_test_db):
+    """
+    Client HTTP de test, partagé par toute la session.
+    Le lifespan de l'app (création des tables, arrêt) n'est exécuté qu'une fois.
+    """
     from httpx import ASGITransport, AsyncClient
-    transport = ASGITransport(app=setup_test_db)
-    return AsyncClient(transport=transport, base_url="http://test")
+    # Patcher le chargement initial des clubs pour ne pas appeler le réseau
+    with patch('src.scraper.clubs_scraper.get_all_clubs', return_value=[]):
+        async with app.router.lifespan_context(app):
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                yield client
+
+
+# Données de test insérées par seed_data (tuples prêts pour executemany)
+_CLUBS_ROWS = (
+    ('H004', 'CTT Hainaut', 'Hainaut'),
+    ('BW023', 'Club BW', 'Brabant Wallon'),
+)
+_PLAYERS_ROWS = (
+    ('152174', 'DUPONT Jean', 'H004', 'C2', 'S', 1500.0, 1550.0, 42, 30, 10, '2025-01-15'),
+)
+_MATCHES_ROWS = (
+    ('152174', 'masculine', '2025-01-10', 'Prov. 1A', 'BW023', 'MARTIN Pierre',
+     '167890', 'C4', 1300.0, '3-1', True, 5.5),
+)
 
 
 @pytest.fixture
 def seed_data():
-    """Insère des données de test dans la DB."""
-    from src.database import queries
-    queries.insert_club({
-        'code': 'H004', 'name': 'CTT Hainaut', 'province': 'Hainaut',
-        'full_name': None, 'email': None, 'phone': None, 'status': None,
-        'website': None, 'has_shower': None, 'venue_name': None,
-        'venue_address': None, 'venue_phone': None, 'venue_pmr': None,
-        'venue_remarks': None, 'teams_men': 0, 'teams_women': 0,
-        'teams_youth': 0, 'teams_veterans': 0, 'label': None, 'palette': None,
-    })
-    queries.insert_club({
-        'code': 'BW023', 'name': 'Club BW', 'province': 'Brabant Wallon',
-        'full_name': None, 'email': None, 'phone': None, 'status': None,
-        'website': None, 'has_shower': None, 'venue_name': None,
-        'venue_address': None, 'venue_phone': None, 'venue_pmr': None,
-        'venue_remarks': None, 'teams_men': 0, 'teams_women': 0,
-        'teams_youth': 0, 'teams_veterans': 0, 'label': None, 'palette': None,
-    })
-    queries.insert_player({
-        'licence': '152174', 'name': 'DUPONT Jean', 'club_code': 'H004',
-        'ranking': 'C2', 'category': 'S', 'points_start': 1500.0,
-        'points_current': 1550.0, 'ranking_position': 42,
-        'total_wins': 30, 'total_losses': 10,
-        'women_ranking': None, 'women_points_start': None,
-        'women_points_current': None, 'women_total_wins': 0,
-        'women_total_losses': 0, 'last_update': '2025-01-15',
-    })
-    queries.insert_match({
-        'player_licence': '152174', 'fiche_type': 'masculine',
-        'date': '2025-01-10', 'division': 'Prov. 1A',
-        'opponent_club': 'BW023', 'opponent_name': 'MARTIN Pierre',
-        'opponent_licence': '167890', 'opponent_ranking': 'C4',
-        'opponent_points': 1300.0, 'score': '3-1',
-        'won': True, 'points_change': 5.5,
-    })
+    """Insère des données de test dans la DB, en une seule transaction."""
+    from src.database.connection import get_db
+    with get_db() as db:
+        db.executemany("INSERT INTO clubs (code, name, province) VALUES (?, ?, ?)", _CLUBS_ROWS)
+        db.executemany("""
+            INSERT INTO players (licence, name, club_code, ranking, category,
+                                 points_start, points_current, ranking_position,
+                                 total_wins, total_losses, last_update)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, _PLAYERS_ROWS)
+        db.executemany("""
+            INSERT INTO matches (player_licence, fiche_type, date, division,
+                                 opponent_club, opponent_name, opponent_licence,
+                                 opponent_ranking, opponent_points, score, won, points_change)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, _MATCHES_ROWS)
 
 
 # =============================================================================
@@ -102,25 +119,17 @@ def seed_data():
 # =============================================================================
 
 class TestHealth:
-    @pytest.mark.asyncio
-    async def test_health(self, client):
-        resp = await client.get("/health")
-        assert resp.status_code == 200
-        assert resp.json()["status"] == "ok"
-
-    @pytest.mark.asyncio
-    async def test_api_info(self, client):
-        resp = await client.get("/api")
-        assert resp.status_code == 200
-        data = resp.json()
+    async def test_health_endpoints(self, client):
+        # Endpoints en lecture seule et sans état : requêtes lancées en parallèle
+        health, info, stats = await asyncio.gather(
+            client.get("/health"), client.get("/api"), client.get("/api/stats")
+        )
+        assert health.status_code == info.status_code == stats.status_code == 200
+        assert health.json()["status"] == "ok"
+        data = info.json()
         assert data["name"] == "AFTT Data API"
         assert "endpoints" in data
-
-    @pytest.mark.asyncio
-    async def test_stats(self, client):
-        resp = await client.get("/api/stats")
-        assert resp.status_code == 200
-        data = resp.json()
+        data = stats.json()
         assert "clubs" in data
         assert "players" in data
 
@@ -130,14 +139,12 @@ class TestHealth:
 # =============================================================================
 
 class TestClubsAPI:
-    @pytest.mark.asyncio
     async def test_list_clubs(self, client, seed_data):
         resp = await client.get("/api/clubs")
         assert resp.status_code == 200
         data = resp.json()
         assert data["count"] == 2
 
-    @pytest.mark.asyncio
     async def test_get_club(self, client, seed_data):
         resp = await client.get("/api/clubs/H004")
         assert resp.status_code == 200
@@ -145,17 +152,14 @@ class TestClubsAPI:
         assert data["code"] == "H004"
         assert data["name"] == "CTT Hainaut"
 
-    @pytest.mark.asyncio
     async def test_get_club_not_found(self, client):
         resp = await client.get("/api/clubs/ZZ99")
         assert resp.status_code == 404
 
-    @pytest.mark.asyncio
     async def test_get_club_invalid_code(self, client):
         resp = await client.get("/api/clubs/invalid!")
         assert resp.status_code == 400
 
-    @pytest.mark.asyncio
     async def test_get_club_players(self, client, seed_data):
         resp = await client.get("/api/clubs/H004/players")
         assert resp.status_code == 200
@@ -163,7 +167,6 @@ class TestClubsAPI:
         assert data["count"] == 1
         assert data["players"][0]["licence"] == "152174"
 
-    @pytest.mark.asyncio
     async def test_get_provinces(self, client, seed_data):
         resp = await client.get("/api/clubs/provinces")
         assert resp.status_code == 200
@@ -176,7 +179,6 @@ class TestClubsAPI:
 # =============================================================================
 
 class TestPlayersAPI:
-    @pytest.mark.asyncio
     async def test_get_player(self, client, seed_data):
         resp = await client.get("/api/players/152174")
         assert resp.status_code == 200
@@ -186,12 +188,10 @@ class TestPlayersAPI:
         assert "stats_masculine" in data
         assert "matches_masculine" in data
 
-    @pytest.mark.asyncio
     async def test_get_player_not_found(self, client):
         resp = await client.get("/api/players/999999")
         assert resp.status_code == 404
 
-    @pytest.mark.asyncio
     async def test_get_player_matches(self, client, seed_data):
         resp = await client.get("/api/players/152174/matches")
         assert resp.status_code == 200
@@ -199,7 +199,6 @@ class TestPlayersAPI:
         assert data["count"] == 1
         assert data["matches"][0]["opponent_name"] == "MARTIN Pierre"
 
-    @pytest.mark.asyncio
     async def test_list_players(self, client, seed_data):
         resp = await client.get("/api/players", params={"club_code": "H004"})
         assert resp.status_code == 200
@@ -212,56 +211,27 @@ class TestPlayersAPI:
 # =============================================================================
 
 class TestValidation:
-    @pytest.mark.asyncio
-    async def test_invalid_licence_format(self, client):
-        resp = await client.get("/api/players/abc")
-        assert resp.status_code == 400
-        assert "invalide" in resp.json()["detail"].lower()
-
-    @pytest.mark.asyncio
-    async def test_invalid_licence_too_short(self, client):
-        resp = await client.get("/api/players/123")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_invalid_licence_special_chars(self, client):
-        resp = await client.get("/api/players/12345'OR 1=1")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_valid_licence_format(self, client):
-        # Format valide mais joueur n'existe pas => 404 pas 400
-        resp = await client.get("/api/players/123456")
-        assert resp.status_code == 404
-
-    @pytest.mark.asyncio
-    async def test_invalid_club_code(self, client):
-        resp = await client.get("/api/clubs/INVALID!")
-        assert resp.status_code == 400
-        assert "invalide" in resp.json()["detail"].lower()
-
-    @pytest.mark.asyncio
-    async def test_invalid_club_code_injection(self, client):
-        resp = await client.get("/api/clubs/H004';DROP TABLE clubs;--")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_valid_club_code_format(self, client):
-        # Format valide mais club n'existe pas => 404 pas 400
-        resp = await client.get("/api/clubs/ZZ99")
-        assert resp.status_code == 404
-
-    @pytest.mark.asyncio
-    async def test_scrape_player_invalid_licence(self, client):
-        resp = await client.post("/api/players/abc/scrape")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_scrape_club_invalid_code(self, client):
-        resp = await client.post("/api/clubs/INVALID!/scrape")
-        assert resp.status_code == 400
-
-    @pytest.mark.asyncio
-    async def test_player_matches_invalid_licence(self, client):
-        resp = await client.get("/api/players/abc/matches")
+    # Format valide mais ressource inexistante => 404 pas 400
+    @pytest.mark.parametrize("path,expected", [
+        ("/api/players/abc", 400),
+        ("/api/players/123", 400),
+        ("/api/players/12345'OR 1=1", 400),
+        ("/api/players/123456", 404),
+        ("/api/clubs/INVALID!", 400),
+        ("/api/clubs/H004';DROP TABLE clubs;--", 400),
+        ("/api/clubs/ZZ99", 404),
+        ("/api/players/abc/matches", 400),
+    ])
+    async def test_get_validation(self, client, path, expected):
+        resp = await client.get(path)
+        assert resp.status_code == expected
+        if expected == 400:
+            assert "invalide" in resp.json()["detail"].lower()
+
+    @pytest.mark.parametrize("path", [
+        "/api/players/abc/scrape",
+        "/api/clubs/INVALID!/scrape",
+    ])
+    async def test_scrape_validation(self, client, path):
+        resp = await client.post(path)
         assert resp.status_code == 400
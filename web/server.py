@@ -1,13 +1,35 @@
 """
 Serveur HTTP simple pour servir l'interface web AFTT Data Explorer
+
+Notes de performance : le serveur est limité par les E/S et les octets envoyés,
+pas par le calcul (chaque requête ne fait qu'ouvrir, lire et écrire un fichier).
+Les optimisations portent donc sur les données transférées :
+  1. envoi sans copie (sendfile) des gros fichiers ;
+  2. caches d'octets (fichiers, /api/list) et réponses 304 ;
+  3. copies .gz/.br précompressées à l'écriture.
+Éviter d'ajouter des transformations Python par requête (décodage, réencodage).
 """
 import http.server
-import socketserver
 import os
 import sys
 import json
+import re
+import signal
+import socket
+import traceback
+import email.utils
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+# orjson (optionnel) sérialise directement en bytes, en C ; sinon json standard
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -15,57 +37,345 @@ if sys.platform == 'win32':
 
 PORT = 8080
 
+# Dossier web (fichiers statiques) et dossier data (exports JSON), calculés une fois
+_WEB_DIR = os.path.dirname(os.path.abspath(__file__))
+_DATA_DIR = os.path.normpath(os.path.join(_WEB_DIR, '..', 'data'))
+
+# Nombre de processus serveur. Au-delà de 1, chaque processus ouvre son propre socket
+# d'écoute avec SO_REUSEPORT et le noyau répartit les connexions entre eux
+# (un GIL par processus). Ignoré là où SO_REUSEPORT ou fork n'existent pas.
+WORKERS = int(os.environ.get('AFTT_WEB_WORKERS', '1'))
+
+# Fichiers de data/ : members_{club}.json et player_{licence}.json
+_MEMBERS_PREFIX = 'members_'
+_PLAYER_PREFIX = 'player_'
+_JSON_SUFFIX = '.json'
+_MEMBERS_PREFIX_LEN = len(_MEMBERS_PREFIX)
+_PLAYER_PREFIX_LEN = len(_PLAYER_PREFIX)
+_JSON_SUFFIX_LEN = len(_JSON_SUFFIX)
+
+# Routes /api, résolues par un seul match ; lastgroup donne la route.
+# Codes de club et licences limités à [A-Za-z0-9]{1,16} : aucun segment du chemin
+# ne peut sortir de data/ et un segment invalide ne coûte aucun accès disque.
+_API_PREFIX = '/api/'
+_ROUTE_RE = re.compile(
+    r'/api/(?:(?P<clubs>clubs)|(?P<list>list)'
+    r'|members/(?P<club_code>[A-Za-z0-9]{1,16})|player/(?P<licence>[A-Za-z0-9]{1,16}))\Z'
+)
+
+# En-têtes CORS (chargement local), déjà encodés : ajoutés tels quels à chaque réponse
+_CORS_HEADERS = (
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type\r\n'
+)
+
+# Corps des réponses 404 de l'API, sérialisé une seule fois
+_NOT_FOUND_BODY = _dumps({'error': 'File not found'})
+
+# Fichiers JSON gardés en mémoire s'ils font moins de _MEMORY_CACHE_MAX_SIZE octets ;
+# les plus gros sont envoyés par sendfile depuis le disque. Le cache entier est
+# borné à _MEMORY_CACHE_BUDGET octets par processus (à multiplier par WORKERS).
+_MEMORY_CACHE_MAX_SIZE = 1_000_000
+_MEMORY_CACHE_BUDGET = 64 * 1024 * 1024
+
+# os.pread et os.sendfile n'existent pas sous Windows
+_HAS_PREAD = hasattr(os, 'pread')
+_HAS_SENDFILE = hasattr(os, 'sendfile')
+
+# Tampon d'envoi des sockets (SO_SNDBUF) et taille des tranches de sendfile :
+# chaque appel remplit au plus le tampon, les autres threads avancent entre deux
+_SEND_BUFFER_SIZE = 1 << 20
+
+# Copies précompressées écrites à côté des .json par src/scraper/json_export.py,
+# par ordre de préférence : (codage Accept-Encoding, extension du fichier)
+_PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+def _read_file(path, size):
+    """Contenu brut d'un fichier dont la taille est connue (stat)."""
+    if _HAS_PREAD:
+        # La taille est connue : un seul pread, sans objet fichier bufferisé
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            data = os.pread(fd, size + 1, 0)
+        finally:
+            os.close(fd)
+        if len(data) == size:
+            return data
+        # Taille différente du stat (fichier réécrit entre-temps) : lecture complète
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class _FileBytesCache:
+    """
+    Cache LRU du contenu des fichiers, borné en octets (et non en nombre d'entrées).
+    Une entrée par chemin, valide tant que (mtime_ns, size) n'a pas changé :
+    un fichier réécrit remplace son ancienne version au lieu de s'y ajouter.
+    """
+    
+    def __init__(self, budget):
+        self._budget = budget
+        self._entries = OrderedDict()  # chemin -> ((mtime_ns, size), bytes)
+        self._total = 0
+        self._lock = threading.Lock()
+    
+    def get(self, path, mtime_ns, size):
+        version = (mtime_ns, size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(path)
+                return entry[1]
+        
+        data = _read_file(path, size)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total -= len(old[1])
+            self._entries[path] = (version, data)
+            self._total += len(data)
+            while self._total > self._budget:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total -= len(evicted)
+        return data
+
+
+_file_cache = _FileBytesCache(_MEMORY_CACHE_BUDGET)
+
+
 class AFTTHandler(http.server.SimpleHTTPRequestHandler):
     """Handler personnalisé pour servir les fichiers statiques et JSON"""
     
+    # Réponse /api/list déjà sérialisée, avec le mtime du dossier data au moment
+    # du scan : (st_mtime_ns, bytes). Ajouter ou supprimer un fichier change le mtime.
+    _list_cache = (None, None)
+    
+    # TCP_NODELAY sur chaque connexion : les petites réponses JSON partent sans
+    # attendre l'ACK du paquet précédent (Nagle)
+    disable_nagle_algorithm = True
+    
     def __init__(self, *args, **kwargs):
         # Le dossier web contient les fichiers statiques
-        super().__init__(*args, directory=os.path.dirname(os.path.abspath(__file__)), **kwargs)
+        super().__init__(*args, directory=_WEB_DIR, **kwargs)
     
     def end_headers(self):
-        # CORS headers pour permettre le chargement local
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self._append_cors_headers()
         super().end_headers()
     
+    def _append_cors_headers(self):
+        """CORS headers pour permettre le chargement local (toutes les réponses)"""
+        if self.request_version != 'HTTP/0.9':
+            self._headers_buffer.append(_CORS_HEADERS)
+    
+    def do_OPTIONS(self):
+        # Requête preflight CORS : les en-têtes suffisent
+        self.send_response(204)
+        self.end_headers()
+    
     def do_GET(self):
+        if not self.route_api():
+            super().do_GET()
+    
+    def do_HEAD(self):
+        # Mêmes en-têtes que GET, sans corps (voir _end_headers_with_body)
+        if not self.route_api():
+            super().do_HEAD()
+    
+    def route_api(self):
+        """Traite les routes /api ; retourne False si la requête n'en fait pas partie"""
         # API pour charger les données depuis le dossier data
-        if self.path == '/api/clubs':
-            self.serve_json('../data/clubs.json')
-        elif self.path.startswith('/api/members/'):
-            club_code = self.path.split('/')[-1]
-            self.serve_json(f'../data/members_{club_code}.json')
-        elif self.path.startswith('/api/player/'):
-            licence = self.path.split('/')[-1]
-            self.serve_json(f'../data/player_{licence}.json')
-        elif self.path == '/api/list':
-            self.list_data_files()
+        match = _ROUTE_RE.match(self.path)
+        if match is None:
+            if not self.path.startswith(_API_PREFIX):
+                return False
+            self._send_not_found()
+            return True
+        
+        route = match.lastgroup
+        if route == 'clubs':
+            self.serve_json('clubs.json')
+        elif route == 'club_code':
+            self.serve_json(f'members_{match.group(route)}.json')
+        elif route == 'licence':
+            self.serve_json(f'player_{match.group(route)}.json')
         else:
-            super().do_GET()
+            self.list_data_files()
+        return True
     
-    def serve_json(self, filepath):
-        """Sert un fichier JSON"""
-        base_path = os.path.dirname(os.path.abspath(__file__))
-        full_path = os.path.join(base_path, filepath)
+    def serve_json(self, filename):
+        """Sert un fichier JSON du dossier data"""
+        full_path = os.path.join(_DATA_DIR, filename)
+        
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            st = None
+        
+        encoding = None
+        if st is not None:
+            full_path, st, encoding = self._negotiate_encoding(full_path, st)
+            # Validateurs de la variante servie (la copie .gz/.br a sa propre taille)
+            etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+            if self._is_not_modified(etag, st.st_mtime):
+                self._send_not_modified(etag, st.st_mtime, vary=True)
+                return
         
-        if os.path.exists(full_path):
+        if st is not None and st.st_size < _MEMORY_CACHE_MAX_SIZE:
+            # Fichiers courants (clubs, membres, joueurs) : servis depuis la mémoire
+            payload = _file_cache.get(full_path, st.st_mtime_ns, st.st_size)
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            with open(full_path, 'r', encoding='utf-8') as f:
-                self.wfile.write(f.read().encode('utf-8'))
+            self._send_encoding_headers(encoding)
+            self._send_validators(etag, st.st_mtime)
+            self.send_header('Content-Length', str(len(payload)))
+            self._end_headers_with_body(payload)
+        elif st is not None:
+            # Le fichier est déjà du JSON UTF-8 : envoyé tel quel, sans décodage
+            with open(full_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self._send_encoding_headers(encoding)
+                self._send_validators(etag, st.st_mtime)
+                self.send_header('Content-Length', str(size))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.flush()
+                    self._sendfile(f, size)
         else:
-            self.send_response(404)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({'error': 'File not found'}).encode('utf-8'))
+            self._send_not_found()
+    
+    def _send_not_found(self):
+        """Réponse 404 JSON de l'API"""
+        self.send_response(404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(_NOT_FOUND_BODY)))
+        self._end_headers_with_body(_NOT_FOUND_BODY)
+    
+    def _sendfile(self, f, size):
+        """Envoie le fichier par os.sendfile (copie noyau page cache -> socket),
+        en tranches de _SEND_BUFFER_SIZE ; sinon socket.sendfile (send() successifs)"""
+        if not _HAS_SENDFILE:
+            self.connection.sendfile(f, 0, size)
+            return
+        out_fd = self.connection.fileno()
+        in_fd = f.fileno()
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(out_fd, in_fd, offset, min(_SEND_BUFFER_SIZE, size - offset))
+            if sent == 0:
+                # Fichier tronqué pendant l'envoi : Content-Length ne sera pas atteint
+                self.close_connection = True
+                break
+            offset += sent
+    
+    def _negotiate_encoding(self, full_path, st):
+        """Choisit la copie .br/.gz du fichier si le client l'accepte et qu'elle
+        n'est pas plus ancienne que le JSON. Retourne (chemin, stat, codage ou None)."""
+        accepted = set()
+        for token in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = token.partition(';')
+            params = params.replace(' ', '')
+            if params in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                continue
+            accepted.add(name.strip().lower())
+        
+        for encoding, extension in _PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_st = os.stat(full_path + extension)
+            except OSError:
+                continue
+            if compressed_st.st_mtime_ns >= st.st_mtime_ns:
+                return full_path + extension, compressed_st, encoding
+        return full_path, st, None
+    
+    def _send_encoding_headers(self, encoding):
+        """En-têtes d'une réponse JSON négociée sur Accept-Encoding"""
+        if encoding is not None:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
     
     def list_data_files(self):
-        """Liste les fichiers de données disponibles"""
-        base_path = os.path.dirname(os.path.abspath(__file__))
-        data_path = os.path.join(base_path, '../data')
+        """Liste les fichiers de données disponibles (rescan seulement si data/ a changé)"""
+        data_path = _DATA_DIR
+        
+        try:
+            data_st = os.stat(data_path)
+        except OSError:
+            data_st = None
+        mtime = data_st.st_mtime_ns if data_st is not None else None
+        
+        # Le mtime du dossier identifie la version de la liste
+        etag = f'W/"{mtime}"' if mtime is not None else None
+        if etag is not None and self._is_not_modified(etag, data_st.st_mtime):
+            self._send_not_modified(etag, data_st.st_mtime)
+            return
+        
+        cached_mtime, payload = AFTTHandler._list_cache
+        if payload is None or cached_mtime != mtime:
+            payload = _dumps(self._scan_data_files(data_path))
+            AFTTHandler._list_cache = (mtime, payload)
         
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if etag is not None:
+            self._send_validators(etag, data_st.st_mtime)
+        self.send_header('Content-Length', str(len(payload)))
+        self._end_headers_with_body(payload)
+    
+    def _is_not_modified(self, etag, mtime):
+        """True si la copie du client est à jour : If-None-Match contient l'ETag,
+        ou à défaut If-Modified-Since n'est pas antérieur au mtime (à la seconde près)"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            if if_none_match.strip() == '*':
+                return True
+            return etag in (tag.strip() for tag in if_none_match.split(','))
+        
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if not if_modified_since:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        if since.tzinfo is None:
+            return False
+        return int(mtime) <= since.timestamp()
+    
+    def _send_validators(self, etag, mtime):
+        """En-têtes ETag et Last-Modified d'une réponse"""
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', email.utils.formatdate(mtime, usegmt=True))
+    
+    def _send_not_modified(self, etag, mtime, vary=False):
+        """Réponse 304 : le client réutilise sa copie, aucun corps envoyé"""
+        self.send_response(304)
+        self._send_validators(etag, mtime)
+        if vary:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+    
+    def _end_headers_with_body(self, payload):
+        """Termine les en-têtes et ajoute le corps au même tampon : en-têtes et
+        corps partent en un seul write (un seul send()) au lieu de deux"""
+        if self.command == 'HEAD' or self.request_version == 'HTTP/0.9':
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(payload)
+            return
+        self._append_cors_headers()
+        self._headers_buffer.append(b'\r\n')
+        self._headers_buffer.append(payload)
+        self.flush_headers()
+    
+    @staticmethod
+    def _scan_data_files(data_path):
+        """Parcourt le dossier data et regroupe les fichiers par type"""
         files = {
             'clubs': None,
             'members': [],
@@ -73,35 +383,105 @@ class AFTTHandler(http.server.SimpleHTTPRequestHandler):
         }
         
         if os.path.exists(data_path):
-            for filename in os.listdir(data_path):
-                if filename == 'clubs.json':
-                    files['clubs'] = filename
-                elif filename.startswith('members_') and filename.endswith('.json'):
-                    club_code = filename.replace('members_', '').replace('.json', '')
-                    files['members'].append(club_code)
-                elif filename.startswith('player_') and filename.endswith('.json'):
-                    licence = filename.replace('player_', '').replace('.json', '')
-                    files['players'].append(licence)
+            # scandir : les noms viennent directement du readdir, sans liste intermédiaire.
+            # Le premier caractère écarte la plupart des noms avant les tests de préfixe.
+            with os.scandir(data_path) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if filename == 'clubs.json':
+                        files['clubs'] = filename
+                    elif not filename.endswith(_JSON_SUFFIX):
+                        continue
+                    elif filename[0] == 'p' and filename.startswith(_PLAYER_PREFIX):
+                        files['players'].append(filename[_PLAYER_PREFIX_LEN:-_JSON_SUFFIX_LEN])
+                    elif filename[0] == 'm' and filename.startswith(_MEMBERS_PREFIX):
+                        files['members'].append(filename[_MEMBERS_PREFIX_LEN:-_JSON_SUFFIX_LEN])
         
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps(files).encode('utf-8'))
+        return files
+
+class AFTTServer(http.server.ThreadingHTTPServer):
+    """Un thread par connexion : un gros fichier ou un client lent ne bloque pas
+    les autres requêtes /api"""
+    daemon_threads = True
+    allow_reuse_address = True
+    # File d'attente de listen() (5 par défaut dans socketserver)
+    request_queue_size = 1024
+    # Tampon d'envoi du socket d'écoute, hérité par les connexions acceptées :
+    # un sendfile de plusieurs Mo se vide en moins d'appels
+    send_buffer_size = _SEND_BUFFER_SIZE
+    
+    def server_bind(self):
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_size)
+        super().server_bind()
+
+
+def _run_worker():
+    """Boucle d'un worker forké. Ne rend jamais la main (os._exit) : le code
+    d'arrêt du processus principal ne doit pas s'exécuter dans un worker."""
+    status = 1
+    try:
+        with AFTTServer(("", PORT), AFTTHandler) as httpd:
+            httpd.serve_forever()
+        status = 0
+    except KeyboardInterrupt:
+        status = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        os._exit(status)
+
+
+def _raise_system_exit(signum, frame):
+    """SIGTERM du processus principal : sortir par les blocs finally (arrêt des workers)"""
+    raise SystemExit(0)
+
+
+def _stop_workers(worker_pids):
+    """Arrête les workers forkés (SIGTERM) et attend leur fin"""
+    for pid in worker_pids:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for pid in worker_pids:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+
 
 def run_server():
     """Lance le serveur HTTP"""
-    with socketserver.TCPServer(("", PORT), AFTTHandler) as httpd:
-        print(f"🏓 AFTT Data Explorer")
-        print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print(f"📡 Serveur démarré sur http://localhost:{PORT}")
-        print(f"📁 Dossier web: {os.path.dirname(os.path.abspath(__file__))}")
-        print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print(f"Appuyez sur Ctrl+C pour arrêter")
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n🛑 Serveur arrêté")
-            sys.exit(0)
+    workers = WORKERS if hasattr(socket, 'SO_REUSEPORT') and hasattr(os, 'fork') else 1
+    AFTTServer.allow_reuse_port = workers > 1
+    
+    # Les workers sont forkés avant le bind : chacun a son socket et ses caches.
+    # Le processus principal garde leurs PID pour les arrêter en sortant.
+    worker_pids = []
+    try:
+        for _ in range(workers - 1):
+            pid = os.fork()
+            if pid == 0:
+                _run_worker()
+            worker_pids.append(pid)
+        if worker_pids:
+            signal.signal(signal.SIGTERM, _raise_system_exit)
+        
+        with AFTTServer(("", PORT), AFTTHandler) as httpd:
+            print(f"🏓 AFTT Data Explorer")
+            print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            print(f"📡 Serveur démarré sur http://localhost:{PORT}")
+            print(f"📁 Dossier web: {_WEB_DIR}")
+            if workers > 1:
+                print(f"⚙️  Workers: {workers} (SO_REUSEPORT)")
+            print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+            print(f"Appuyez sur Ctrl+C pour arrêter")
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                print("\n🛑 Serveur arrêté")
+    finally:
+        _stop_workers(worker_pids)
 
 if __name__ == "__main__":
     run_server()